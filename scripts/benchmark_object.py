@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+比较 TickData/BarData 与 SlotTickData/SlotBarData 的构造耗时和内存占用
+"""
+
+import gc
+import tracemalloc
+from datetime import datetime
+from timeit import timeit
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import TickData, BarData, SlotTickData, SlotBarData
+
+
+COUNT: int = 100_000
+
+
+def create_tick(cls: type) -> object:
+    """创建Tick对象"""
+    return cls(
+        gateway_name="BENCH",
+        symbol="rb2510",
+        exchange=Exchange.SHFE,
+        datetime=datetime(2025, 1, 2, 9, 30),
+        last_price=3500,
+        volume=1000,
+        bid_price_1=3499,
+        ask_price_1=3501,
+        bid_volume_1=10,
+        ask_volume_1=12,
+    )
+
+
+def create_bar(cls: type) -> object:
+    """创建Bar对象"""
+    return cls(
+        gateway_name="BENCH",
+        symbol="rb2510",
+        exchange=Exchange.SHFE,
+        datetime=datetime(2025, 1, 2, 9, 30),
+        interval=Interval.MINUTE,
+        open_price=3500,
+        high_price=3510,
+        low_price=3495,
+        close_price=3505,
+        volume=1000,
+    )
+
+
+def measure_time(func: object, cls: type) -> float:
+    """测量单个对象构造耗时（纳秒）"""
+    seconds: float = timeit(lambda: func(cls), number=COUNT)     # type: ignore
+    return seconds / COUNT * 1e9
+
+
+def measure_memory(func: object, cls: type) -> float:
+    """测量单个对象内存占用（字节）"""
+    gc.collect()
+    tracemalloc.start()
+
+    objects: list = [func(cls) for _ in range(COUNT)]      # type: ignore
+
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Exclude the list holding objects
+    size -= objects.__sizeof__()
+    return size / COUNT
+
+
+def main() -> None:
+    """运行测试"""
+    cases: list = [
+        ("TickData", create_tick, TickData),
+        ("SlotTickData", create_tick, SlotTickData),
+        ("BarData", create_bar, BarData),
+        ("SlotBarData", create_bar, SlotBarData),
+    ]
+
+    print(f"{'类型':<16}{'构造耗时(ns)':>16}{'内存占用(B)':>16}")
+
+    for name, func, cls in cases:
+        cost: float = measure_time(func, cls)
+        memory: float = measure_memory(func, cls)
+        print(f"{name:<16}{cost:>16.0f}{memory:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+比较 RPC 各编码器对 TickData 的编解码耗时、消息大小，以及逐条和批量模式下的发布吞吐量
+"""
+
+from datetime import datetime
+from threading import Thread
+from time import perf_counter, sleep
+from timeit import timeit
+from zoneinfo import ZoneInfo
+
+import zmq
+
+from vnpy.rpc import RpcServer, BaseCodec, PickleCodec, MsgpackCodec
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import TickData
+
+
+COUNT: int = 100_000
+PUBLISH_COUNT: int = 100_000
+BATCH_SIZE: int = 100
+
+REP_ADDRESS: str = "tcp://127.0.0.1:32001"
+PUB_ADDRESS: str = "tcp://127.0.0.1:32002"
+
+
+def create_tick() -> TickData:
+    """创建Tick对象"""
+    return TickData(
+        gateway_name="BENCH",
+        symbol="rb2510",
+        exchange=Exchange.SHFE,
+        datetime=datetime(2025, 1, 2, 9, 30, tzinfo=ZoneInfo("Asia/Shanghai")),
+        last_price=3500,
+        volume=1000,
+        bid_price_1=3499,
+        ask_price_1=3501,
+        bid_volume_1=10,
+        ask_volume_1=12,
+    )
+
+
+def measure_codec(codec: BaseCodec, tick: TickData) -> tuple[float, float, int]:
+    """测量单条消息编码、解码耗时（纳秒）和大小（字节）"""
+    message: list = ["tick", tick]
+    data: bytes = codec.encode(message)
+
+    encode_cost: float = timeit(lambda: codec.encode(message), number=COUNT) / COUNT * 1e9
+    decode_cost: float = timeit(lambda: codec.decode(data), number=COUNT) / COUNT * 1e9
+
+    return encode_cost, decode_cost, len(data)
+
+
+def measure_publish(codec: BaseCodec, tick: TickData, batch_size: int = 0) -> tuple[float, int]:
+    """测量发布吞吐量（条/秒）和订阅端收到的条数"""
+    server: RpcServer = RpcServer(codec, batch_size=batch_size)
+    server.start(REP_ADDRESS, PUB_ADDRESS)
+
+    context: zmq.Context = zmq.Context()
+    socket: zmq.Socket = context.socket(zmq.SUB)
+    socket.setsockopt(zmq.RCVHWM, 0)
+    socket.setsockopt_string(zmq.SUBSCRIBE, "")
+    socket.connect(PUB_ADDRESS)
+    sleep(0.5)
+
+    received: list[int] = [0]
+
+    def receive() -> None:
+        """接收并解码消息"""
+        while socket.poll(1000):
+            frames: list[bytes] = socket.recv_multipart()
+            for data in frames[1:]:
+                codec.decode(data)
+                received[0] += 1
+
+    thread: Thread = Thread(target=receive)
+    thread.start()
+
+    start: float = perf_counter()
+    for _ in range(PUBLISH_COUNT):
+        server.publish("tick", tick)
+    server.flush()
+    cost: float = perf_counter() - start
+
+    thread.join()
+    socket.close()
+    context.term()
+
+    server.stop()
+    server.join()
+
+    return PUBLISH_COUNT / cost, received[0]
+
+
+def main() -> None:
+    """运行测试"""
+    tick: TickData = create_tick()
+
+    codecs: list[BaseCodec] = [PickleCodec()]
+    try:
+        codecs.append(MsgpackCodec())
+    except ModuleNotFoundError:
+        print("未安装msgpack，跳过MsgpackCodec测试")
+
+    print(
+        f"{'编码器':<10}{'编码(ns)':>12}{'解码(ns)':>12}{'大小(B)':>10}"
+        f"{'逐条发布(条/秒)':>18}{'批量发布(条/秒)':>18}{'收到(条)':>10}"
+    )
+
+    for codec in codecs:
+        encode_cost, decode_cost, size = measure_codec(codec, tick)
+        throughput, received = measure_publish(codec, tick)
+        batch_throughput, batch_received = measure_publish(codec, tick, BATCH_SIZE)
+
+        print(
+            f"{codec.name:<10}{encode_cost:>12.0f}{decode_cost:>12.0f}{size:>10}"
+            f"{throughput:>18.0f}{batch_throughput:>18.0f}{min(received, batch_received):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from vnpy.trader.constant import Direction, Exchange, Offset, Product, Status
+from vnpy.trader.converter import PositionHolding
+from vnpy.trader.object import ContractData, OrderData, PositionData, TradeData
+
+
+FROZEN_FIELDS: list[str] = [
+    "long_td_frozen",
+    "long_yd_frozen",
+    "long_pos_frozen",
+    "short_td_frozen",
+    "short_yd_frozen",
+    "short_pos_frozen",
+]
+
+DIRECTIONS: list[Direction] = [Direction.LONG, Direction.SHORT]
+CLOSE_OFFSETS: list[Offset] = [Offset.CLOSE, Offset.CLOSETODAY, Offset.CLOSEYESTERDAY]
+ORDER_OFFSETS: list[Offset] = [Offset.OPEN, *CLOSE_OFFSETS]
+UPDATE_STATUSES: list[Status] = [Status.NOTTRADED, Status.PARTTRADED, Status.ALLTRADED, Status.CANCELLED]
+
+
+def get_frozen(holding: PositionHolding) -> list[float]:
+    """"""
+    return [getattr(holding, name) for name in FROZEN_FIELDS]
+
+
+def run_random_updates(rng: random.Random, exchange: Exchange, steps: int) -> None:
+    """
+    Apply random position, trade and order updates, and check frozen
+    volume calculated incrementally against full recompute after each.
+    """
+    contract: ContractData = ContractData(
+        gateway_name="TEST",
+        symbol="test",
+        exchange=exchange,
+        name="test",
+        product=Product.FUTURES,
+        size=1,
+        pricetick=1
+    )
+    holding: PositionHolding = PositionHolding(contract)
+    orders: dict[str, OrderData] = {}
+
+    for _ in range(steps):
+        n: float = rng.random()
+
+        if n < 0.1:
+            position: PositionData = PositionData(
+                gateway_name="TEST",
+                symbol="test",
+                exchange=exchange,
+                direction=rng.choice(DIRECTIONS),
+                volume=rng.randint(0, 30)
+            )
+            position.yd_volume = rng.randint(0, int(position.volume))
+            holding.update_position(position)
+        elif n < 0.2:
+            trade: TradeData = TradeData(
+                gateway_name="TEST",
+                symbol="test",
+                exchange=exchange,
+                orderid="trade",
+                tradeid="trade",
+                direction=rng.choice(DIRECTIONS),
+                offset=rng.choice(ORDER_OFFSETS),
+                volume=rng.randint(1, 5)
+            )
+            holding.update_trade(trade)
+        else:
+            # Update existing order, occasionally with changed direction or offset
+            if orders and rng.random() < 0.6:
+                orderid: str = rng.choice(list(orders))
+                old_order: OrderData = orders[orderid]
+
+                order: OrderData = OrderData(
+                    gateway_name="TEST",
+                    symbol="test",
+                    exchange=exchange,
+                    orderid=orderid,
+                    direction=old_order.direction,
+                    offset=old_order.offset,
+                    volume=old_order.volume,
+                    traded=min(old_order.volume, old_order.traded + rng.randint(0, 3)),
+                    status=rng.choice(UPDATE_STATUSES)
+                )
+
+                if rng.random() < 0.05:
+                    order.direction = rng.choice(DIRECTIONS)
+                    order.offset = rng.choice(ORDER_OFFSETS)
+            else:
+                order = OrderData(
+                    gateway_name="TEST",
+                    symbol="test",
+                    exchange=exchange,
+                    orderid=str(len(orders)),
+                    direction=rng.choice(DIRECTIONS),
+                    offset=rng.choice(ORDER_OFFSETS),
+                    volume=rng.randint(1, 10),
+                    status=Status.NOTTRADED
+                )
+
+            orders[order.orderid] = order
+            holding.update_order(order)
+
+            incremental: list[float] = get_frozen(holding)
+            holding.calculate_frozen_full()
+            assert incremental == get_frozen(holding)
+
+        # Both calculations should also agree after position and trade updates
+        holding.calculate_frozen()
+        incremental = get_frozen(holding)
+
+        holding.calculate_frozen_full()
+        assert incremental == get_frozen(holding)
+
+
+@pytest.mark.parametrize("exchange", [Exchange.SHFE, Exchange.DCE])
+@pytest.mark.parametrize("seed", range(200))
+def test_incremental_frozen_equals_full(exchange: Exchange, seed: int) -> None:
+    """"""
+    run_random_updates(random.Random(seed), exchange, 60)
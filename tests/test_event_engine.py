@@ -0,0 +1,170 @@
+from threading import Event as ThreadEvent, Thread
+
+import pytest
+
+from vnpy.event import EVENT_TIMER, Event, EventEngine, OverflowPolicy
+from vnpy.event.async_engine import AsyncEventEngine
+from vnpy.event.profiler import HandlerProfiler
+from vnpy.event.sharded import ShardedEventEngine
+
+
+def test_handler_put_into_full_queue() -> None:
+    """Handler putting events into full blocking queue should not deadlock"""
+    event_engine: EventEngine = EventEngine(maxsize=2, overflow=OverflowPolicy.BLOCK)
+
+    received: list[int] = []
+    finished: ThreadEvent = ThreadEvent()
+
+    def process_start(event: Event) -> None:
+        for i in range(10):
+            event_engine.put(Event("eData", i))
+        finished.set()
+
+    def process_data(event: Event) -> None:
+        received.append(event.data)
+
+    event_engine.register("eStart", process_start)
+    event_engine.register("eData", process_data)
+    event_engine.start()
+
+    event_engine.put(Event("eStart"))
+    assert finished.wait(5)
+
+    event_engine.stop()
+    assert received == list(range(10))
+
+
+def test_worker_put_into_full_queue() -> None:
+    """Workers putting events into each other's full queue should not deadlock"""
+    event_engine: ShardedEventEngine = ShardedEventEngine(maxsize=1, worker_count=2)
+
+    finished: list[ThreadEvent] = [ThreadEvent(), ThreadEvent()]
+
+    def process_start(event: Event) -> None:
+        for i in range(10):
+            event_engine.put(Event("eData", key=str(i)))
+        finished[int(event.key)].set()
+
+    event_engine.register("eStart", process_start)
+    event_engine.start()
+
+    event_engine.put(Event("eStart", key="0"))
+    event_engine.put(Event("eStart", key="1"))
+    assert all(f.wait(5) for f in finished)
+
+    event_engine.stop()
+
+
+def test_async_engine_prefix_handler() -> None:
+    """Prefix handlers of asyncio engine should receive matched events"""
+    event_engine: AsyncEventEngine = AsyncEventEngine()
+
+    received: list[str] = []
+    finished: ThreadEvent = ThreadEvent()
+
+    async def process_tick(event: Event) -> None:
+        received.append(event.key)
+
+    def process_end(event: Event) -> None:
+        finished.set()
+
+    event_engine.register_prefix("eTick.rb", process_tick)
+    event_engine.register("eEnd", process_end)
+    event_engine.start()
+
+    event_engine.put(Event("eTick.", key="rb2501.SHFE"))
+    event_engine.put(Event("eTick.", key="ag2502.SHFE"))
+    event_engine.put(Event("eTick.", key="rb2505.SHFE"))
+    event_engine.put(Event("eEnd"))
+    assert finished.wait(5)
+
+    event_engine.unregister_prefix("eTick.rb", process_tick)
+    event_engine.stop()
+    assert received == ["rb2501.SHFE", "rb2505.SHFE"]
+
+
+def test_async_engine_handler_exception() -> None:
+    """Exception raised by handler should not stop asyncio engine"""
+    event_engine: AsyncEventEngine = AsyncEventEngine()
+
+    errors: list[BaseException] = []
+    event_engine.get_loop().set_exception_handler(
+        lambda loop, context: errors.append(context["exception"])
+    )
+
+    received: list[int] = []
+    finished: ThreadEvent = ThreadEvent()
+
+    def process_bad(event: Event) -> None:
+        raise ValueError(event.data)
+
+    async def process_data(event: Event) -> None:
+        if event.data == 3:
+            raise RuntimeError(event.data)
+        received.append(event.data)
+
+    def process_end(event: Event) -> None:
+        finished.set()
+
+    event_engine.register("eBad", process_bad)
+    event_engine.register("eData", process_data)
+    event_engine.register("eEnd", process_end)
+    event_engine.start()
+
+    event_engine.put(Event("eData", 1))
+    event_engine.put(Event("eBad", 2))
+    event_engine.put(Event("eData", 3))
+    event_engine.put(Event("eData", 4))
+    event_engine.put(Event("eEnd"))
+    assert finished.wait(5)
+
+    event_engine.stop()
+    assert received == [1, 4]
+    assert [type(e) for e in errors] == [ValueError, RuntimeError]
+
+
+def test_profiler_record_from_threads() -> None:
+    """Handler profiler should not lose records of concurrent workers"""
+    profiler: HandlerProfiler = HandlerProfiler()
+
+    def process_data(event: Event) -> None:
+        pass
+
+    def record() -> None:
+        for i in range(10000):
+            profiler.record_wait(i)
+            profiler.record_handler(process_data, i)
+
+    threads: list[Thread] = [Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    # Snapshot with reset while recording
+    snapshots: list[dict] = [profiler.get_snapshot(reset=True) for _ in range(100)]
+
+    for thread in threads:
+        thread.join()
+    snapshots.append(profiler.get_snapshot(reset=True))
+
+    wait_count: int = sum(snapshot["queue_wait"]["count"] for snapshot in snapshots)
+    handler_count: int = sum(
+        summary["count"]
+        for snapshot in snapshots
+        for summary in snapshot["handlers"].values()
+    )
+    assert wait_count == handler_count == 40000
+
+
+def test_add_timer_empty_name() -> None:
+    """Default timer channel should not be replaced by add_timer"""
+    event_engine: EventEngine = EventEngine(interval=0.05)
+
+    finished: ThreadEvent = ThreadEvent()
+    event_engine.register(EVENT_TIMER, lambda event: finished.set())
+
+    with pytest.raises(ValueError):
+        event_engine.add_timer("", 0.05)
+
+    event_engine.start()
+    assert finished.wait(5)
+    event_engine.stop()
@@ -0,0 +1,50 @@
+from pathlib import Path
+from time import sleep
+
+from vnpy.trader.history import HistoryArchive, HistoryRetention
+
+
+def test_retention_count() -> None:
+    """"""
+    retention: HistoryRetention = HistoryRetention(count=2)
+
+    assert retention.add("a") == []
+    assert retention.add("b") == []
+    assert retention.add("c") == ["a"]
+
+    retention.remove("b")
+    assert retention.add("d") == []
+
+
+def test_archive_save_and_load(tmp_path: Path) -> None:
+    """Records should be loadable both before and after being written"""
+    path: Path = tmp_path.joinpath("history.db")
+    archive: HistoryArchive = HistoryArchive(path)
+
+    archive.save("dborder", [("G.1", {"volume": 1}), ("G.2", {"volume": 2})])
+    assert archive.load("dborder", "G.1") == {"volume": 1}
+
+    archive.save("dborder", [("G.1", {"volume": 3})])
+
+    for _ in range(500):
+        if not archive.pending:
+            break
+        sleep(0.01)
+
+    assert not archive.pending
+    assert archive.load("dborder", "G.1") == {"volume": 3}
+    assert archive.load("dborder", "G.2") == {"volume": 2}
+    archive.close()
+
+
+def test_archive_cleared_for_new_session(tmp_path: Path) -> None:
+    """"""
+    path: Path = tmp_path.joinpath("history.db")
+
+    archive: HistoryArchive = HistoryArchive(path)
+    archive.save("dbtrade", [("G.1", {"volume": 1})])
+    archive.close()
+
+    archive = HistoryArchive(path)
+    assert archive.load("dbtrade", "G.1") is None
+    archive.close()
@@ -0,0 +1,73 @@
+from threading import Event as ThreadEvent
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Direction, Exchange, Product
+from vnpy.trader.converter import OffsetConverter, PositionHolding
+from vnpy.trader.engine import MainEngine
+from vnpy.trader.event import EVENT_CONTRACT, EVENT_CONTRACTS, EVENT_POSITION, EVENT_PRIORITIES
+from vnpy.trader.object import ContractData, PositionData
+
+
+def create_contract(symbol: str) -> ContractData:
+    """"""
+    return ContractData(
+        gateway_name="FAKE",
+        symbol=symbol,
+        exchange=Exchange.SHFE,
+        name=symbol,
+        product=Product.FUTURES,
+        size=10,
+        pricetick=1
+    )
+
+
+def test_position_after_contracts_with_priorities() -> None:
+    """Position pushed after contracts should be applied under backlog"""
+    main_engine: MainEngine = MainEngine(EventEngine(priorities=EVENT_PRIORITIES))
+    event_engine: EventEngine = main_engine.event_engine
+
+    started: ThreadEvent = ThreadEvent()
+    released: ThreadEvent = ThreadEvent()
+    finished: ThreadEvent = ThreadEvent()
+
+    def process_block(event: Event) -> None:
+        started.set()
+        released.wait(5)
+
+    try:
+        event_engine.register("eBlock", process_block)
+        event_engine.register("eDone", lambda event: finished.set())
+
+        # Keep event thread busy so that following events are queued
+        event_engine.put(Event("eBlock"))
+        assert started.wait(5)
+
+        event_engine.put(Event(EVENT_CONTRACTS, [create_contract("rb2510"), create_contract("ag2512")]))
+        event_engine.put(Event(EVENT_CONTRACT, create_contract("cu2511")))
+
+        for symbol in ["rb2510", "cu2511"]:
+            position: PositionData = PositionData(
+                gateway_name="FAKE",
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                direction=Direction.LONG,
+                volume=5,
+                yd_volume=3
+            )
+            event_engine.put(Event(EVENT_POSITION, position, position.vt_symbol))
+
+        event_engine.put(Event("eDone"))
+        released.set()
+        assert finished.wait(5)
+
+        converter: OffsetConverter | None = main_engine.get_converter("FAKE")
+        assert converter
+
+        for vt_symbol in ["rb2510.SHFE", "cu2511.SHFE"]:
+            holding: PositionHolding | None = converter.get_position_holding(vt_symbol)
+            assert holding
+            assert holding.long_pos == 5
+            assert holding.long_yd == 3
+    finally:
+        released.set()
+        main_engine.close()
@@ -0,0 +1,249 @@
+from collections.abc import Generator
+from time import sleep
+
+import pytest
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Direction, Exchange, Offset, OrderType, Status
+from vnpy.trader.engine import MainEngine, RiskEngine
+from vnpy.trader.event import EVENT_ORDER
+from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.object import CancelRequest, OrderData, OrderRequest, QuoteRequest, SubscribeRequest
+
+
+class FakeGateway(BaseGateway):
+    """
+    Gateway accepting or rejecting orders synchronously, and waiting for
+    the order update to be processed by event thread before returning.
+    """
+
+    default_name: str = "FAKE"
+    default_setting: dict = {}
+    exchanges: list[Exchange] = [Exchange.SHFE]
+
+    def __init__(self, event_engine: EventEngine, gateway_name: str) -> None:
+        """"""
+        super().__init__(event_engine, gateway_name)
+
+        self.status: Status = Status.NOTTRADED
+        self.count: int = 0
+
+    def connect(self, setting: dict) -> None:
+        """"""
+        pass
+
+    def close(self) -> None:
+        """"""
+        pass
+
+    def subscribe(self, req: SubscribeRequest) -> None:
+        """"""
+        pass
+
+    def send_order(self, req: OrderRequest) -> str:
+        """"""
+        self.count += 1
+
+        order: OrderData = req.create_order_data(str(self.count), self.gateway_name)
+        order.status = self.status
+        self.on_order(order)
+
+        # Let event thread process the update before returning
+        sleep(0.05)
+
+        return order.vt_orderid
+
+    def cancel_order(self, req: CancelRequest) -> None:
+        """"""
+        pass
+
+    def send_quote(self, req: QuoteRequest) -> str:
+        """"""
+        return f"{self.gateway_name}.quote"
+
+    def query_account(self) -> None:
+        """"""
+        pass
+
+    def query_position(self) -> None:
+        """"""
+        pass
+
+
+@pytest.fixture
+def main_engine() -> Generator[MainEngine, None, None]:
+    """"""
+    main_engine: MainEngine = MainEngine()
+
+    main_engine.add_gateway(FakeGateway)
+
+    risk_engine: RiskEngine = main_engine.risk_engine
+    risk_engine.active = True
+    risk_engine.order_rate_limit = 0
+    risk_engine.active_order_limit = 0
+    risk_engine.notional_limit = 0
+    risk_engine.position_limit = 0
+    risk_engine.self_cross_check = True
+
+    yield main_engine
+
+    main_engine.close()
+
+
+def create_request(
+    direction: Direction,
+    price: float,
+    volume: float = 1,
+    offset: Offset = Offset.OPEN,
+    symbol: str = "rb2510"
+) -> OrderRequest:
+    """"""
+    return OrderRequest(
+        symbol=symbol,
+        exchange=Exchange.SHFE,
+        direction=direction,
+        type=OrderType.LIMIT,
+        volume=volume,
+        price=price,
+        offset=offset
+    )
+
+
+def test_rejected_by_gateway_not_tracked(main_engine: MainEngine) -> None:
+    """Orders rejected synchronously by gateway should not count as active"""
+    gateway = main_engine.get_gateway("FAKE")
+    assert isinstance(gateway, FakeGateway)
+    gateway.status = Status.REJECTED
+
+    risk_engine: RiskEngine = main_engine.risk_engine
+    risk_engine.active_order_limit = 3
+
+    for _ in range(10):
+        assert main_engine.send_order(create_request(Direction.LONG, 100), "FAKE")
+
+    assert not risk_engine.orders
+    assert not risk_engine.get_reject_counts()
+
+
+def test_active_order_limit(main_engine: MainEngine) -> None:
+    """"""
+    risk_engine: RiskEngine = main_engine.risk_engine
+    risk_engine.active_order_limit = 3
+
+    vt_orderids: list[str] = [main_engine.send_order(create_request(Direction.LONG, 100), "FAKE") for _ in range(4)]
+
+    assert all(vt_orderids[:3])
+    assert not vt_orderids[3]
+    assert risk_engine.get_reject_counts() == {"active_order": 1}
+
+
+def test_rate_limit(main_engine: MainEngine) -> None:
+    """"""
+    risk_engine: RiskEngine = main_engine.risk_engine
+    risk_engine.order_rate_limit = 5
+
+    vt_orderids: list[str] = [main_engine.send_order(create_request(Direction.LONG, 100), "FAKE") for _ in range(6)]
+
+    assert all(vt_orderids[:5])
+    assert not vt_orderids[5]
+    assert risk_engine.get_reject_counts() == {"order_rate": 1}
+
+
+def test_notional_and_position_limit(main_engine: MainEngine) -> None:
+    """"""
+    risk_engine: RiskEngine = main_engine.risk_engine
+    risk_engine.notional_limit = 1000
+    risk_engine.position_limit = 5
+
+    assert main_engine.send_order(create_request(Direction.LONG, 100, 5), "FAKE")
+    assert not main_engine.send_order(create_request(Direction.LONG, 10, 1), "FAKE")
+    assert not main_engine.send_order(create_request(Direction.SHORT, 200, 3, Offset.CLOSE), "FAKE")
+
+    assert risk_engine.get_reject_counts() == {"position": 1, "notional": 1}
+
+
+def test_self_cross(main_engine: MainEngine) -> None:
+    """"""
+    risk_engine: RiskEngine = main_engine.risk_engine
+
+    assert main_engine.send_order(create_request(Direction.LONG, 100), "FAKE")
+    assert main_engine.send_order(create_request(Direction.SHORT, 101), "FAKE")
+    assert not main_engine.send_order(create_request(Direction.SHORT, 100), "FAKE")
+    assert not main_engine.send_order(create_request(Direction.LONG, 101), "FAKE")
+
+    quote_req: QuoteRequest = QuoteRequest(
+        symbol="rb2510",
+        exchange=Exchange.SHFE,
+        bid_price=99,
+        bid_volume=1,
+        ask_price=102,
+        ask_volume=1
+    )
+    assert main_engine.send_quote(quote_req, "FAKE")
+
+    quote_req.bid_price = 101
+    assert not main_engine.send_quote(quote_req, "FAKE")
+
+    assert risk_engine.get_reject_counts() == {"self_cross": 3}
+
+
+def test_batch_counts_pending_orders(main_engine: MainEngine) -> None:
+    """"""
+    risk_engine: RiskEngine = main_engine.risk_engine
+    risk_engine.active_order_limit = 2
+
+    reqs: list[OrderRequest] = [create_request(Direction.LONG, 100) for _ in range(3)]
+    vt_orderids: list[str] = main_engine.send_orders(reqs, "FAKE")
+
+    assert [bool(vt_orderid) for vt_orderid in vt_orderids] == [True, True, False]
+    assert len(risk_engine.orders) == 2
+
+
+def test_updated_orderids_bounded(main_engine: MainEngine) -> None:
+    """Order ids remembered for late requests should not grow with fills"""
+    gateway = main_engine.get_gateway("FAKE")
+    assert isinstance(gateway, FakeGateway)
+
+    risk_engine: RiskEngine = main_engine.risk_engine
+
+    # Filled synchronously by gateway
+    gateway.status = Status.ALLTRADED
+    for _ in range(5):
+        assert main_engine.send_order(create_request(Direction.LONG, 100), "FAKE")
+
+    # Filled after tracked
+    gateway.status = Status.NOTTRADED
+    for _ in range(5):
+        vt_orderid: str = main_engine.send_order(create_request(Direction.LONG, 100), "FAKE")
+
+        order: OrderData = risk_engine.orders[vt_orderid]
+        filled: OrderData = OrderData(
+            gateway_name=order.gateway_name,
+            symbol=order.symbol,
+            exchange=order.exchange,
+            orderid=order.orderid,
+            direction=order.direction,
+            offset=order.offset,
+            price=order.price,
+            volume=order.volume,
+            traded=order.volume,
+            status=Status.ALLTRADED
+        )
+        risk_engine.process_order_event(Event(EVENT_ORDER, filled, filled.vt_orderid))
+
+    assert not risk_engine.orders
+    assert not risk_engine.updated_orderids
+
+    # Filled orders not sent from this process
+    risk_engine.UPDATED_ORDERID_LIMIT = 100
+    for i in range(1000):
+        other: OrderData = OrderData(
+            gateway_name="OTHER",
+            symbol="rb2510",
+            exchange=Exchange.SHFE,
+            orderid=str(i),
+            status=Status.ALLTRADED
+        )
+        risk_engine.process_order_event(Event(EVENT_ORDER, other, other.vt_orderid))
+
+    assert len(risk_engine.updated_orderids) == 100
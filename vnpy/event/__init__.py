@@ -1,8 +1,28 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    TimerPolicy,
+    OverflowPolicy,
+    EVENT_TIMER,
+    EVENT_BATCH,
+    EVENT_PROFILE,
+    EVENT_QUEUE_ALERT
+)
+from .sharded import ShardedEventEngine
+from .async_engine import AsyncEventEngine
+from .tracer import LatencyTracer
 
 
 __all__ = [
     "Event",
     "EventEngine",
+    "ShardedEventEngine",
+    "AsyncEventEngine",
+    "LatencyTracer",
+    "TimerPolicy",
+    "OverflowPolicy",
     "EVENT_TIMER",
+    "EVENT_BATCH",
+    "EVENT_PROFILE",
+    "EVENT_QUEUE_ALERT",
 ]
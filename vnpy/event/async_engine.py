@@ -0,0 +1,271 @@
+"""
+Asyncio based event engine which dispatches events on an event loop.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from threading import Lock, Thread, get_ident
+from typing import Any
+
+from .engine import Event, EVENT_TIMER
+from .tracer import LatencyTracer
+
+
+# Handler function can be either normal function or coroutine function.
+AsyncHandlerType = Callable[[Event], Awaitable[None] | None]
+
+
+class AsyncEventEngine:
+    """
+    Event engine running on an asyncio event loop, with the same
+    register/put/start/stop interface of EventEngine.
+
+    Both normal functions and coroutine functions (async def) can be
+    registered as handler. Coroutine handlers are awaited one by one,
+    so that events are still processed in order.
+
+    If no event loop is passed in, a new one is created and run in a
+    separate thread when engine is started.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1,
+        loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """
+        Timer event is generated every 1 second by default, if
+        interval not specified.
+        """
+        self._interval: float = interval
+
+        self._own_loop: bool = loop is None
+        self._loop: asyncio.AbstractEventLoop = loop or asyncio.new_event_loop()
+        self._loop_thread: Thread | None = None
+        self._loop_thread_id: int = 0
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+        self._active: bool = False
+        self._handler_sets: dict[str, dict[AsyncHandlerType, None]] = {}
+        self._handlers: dict[str, tuple[AsyncHandlerType, ...]] = {}
+        self._general_handler_set: dict[AsyncHandlerType, None] = {}
+        self._general_handlers: tuple[AsyncHandlerType, ...] = ()
+        self._prefix_handler_sets: dict[str, dict[AsyncHandlerType, None]] = {}
+        self._prefix_handlers: tuple[tuple[str, tuple[AsyncHandlerType, ...]], ...] = ()
+        self._register_lock: Lock = Lock()
+
+    async def _run(self) -> None:
+        """
+        Get event from queue and then process it.
+        """
+        self._loop_thread_id = get_ident()
+
+        while self._active:
+            event: Event = await self._queue.get()
+            await self._process(event)
+
+    async def _process(self, event: Event) -> None:
+        """
+        First distribute event to those handlers registered listening
+        to this type, and to type + key if event has key.
+
+        Then distribute event to those prefix handlers whose prefix
+        matches type + key.
+
+        At last distribute event to those general handlers which listens
+        to all types.
+        """
+        handlers: tuple = self._handlers.get(event.type, ())
+        if event.key:
+            handlers += self._handlers.get(event.type + event.key, ())
+
+        full_type: str = event.type + event.key
+        for prefix, prefix_handlers in self._prefix_handlers:
+            if full_type.startswith(prefix):
+                handlers += prefix_handlers
+
+        # Exception raised by handler is reported to exception handler
+        # of event loop, so that following handlers and events are
+        # still processed
+        for handler in handlers + self._general_handlers:
+            try:
+                result: Any = handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self._loop.call_exception_handler({
+                    "message": f"Exception in handler {handler!r} of event {event.type}",
+                    "exception": e
+                })
+
+    async def _run_timer(self) -> None:
+        """
+        Generate a timer event every interval second(s), scheduled
+        by the clock of event loop without drift.
+        """
+        next_time: float = self._loop.time() + self._interval
+
+        while self._active:
+            await asyncio.sleep(next_time - self._loop.time())
+            self._queue.put_nowait(Event(EVENT_TIMER))
+
+            next_time += self._interval
+
+    def _start_tasks(self) -> None:
+        """
+        Create engine tasks in event loop.
+        """
+        self._tasks = [
+            self._loop.create_task(self._run()),
+            self._loop.create_task(self._run_timer())
+        ]
+
+    def _stop_tasks(self) -> None:
+        """
+        Cancel engine tasks in event loop.
+        """
+        tasks: list[asyncio.Task] = self._tasks
+        self._tasks = []
+
+        for task in tasks:
+            task.cancel()
+
+        # Stop own event loop after all tasks are cancelled
+        if self._own_loop:
+            future: asyncio.Future = asyncio.gather(*tasks, return_exceptions=True)
+            future.add_done_callback(lambda _: self._loop.stop())
+
+    def start(self) -> None:
+        """
+        Start event engine to process events and generate timer events.
+        """
+        self._active = True
+
+        if self._own_loop:
+            self._loop_thread = Thread(target=self._loop.run_forever)
+            self._loop_thread.start()
+
+        self._loop.call_soon_threadsafe(self._start_tasks)
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+        self._loop.call_soon_threadsafe(self._stop_tasks)
+
+        if self._loop_thread and self._loop_thread.ident != get_ident():
+            self._loop_thread.join()
+            self._loop_thread = None
+
+    def put(self, event: Event) -> None:
+        """
+        Put an event object into event queue. This function is thread-safe
+        and can be called by legacy gateways running in other threads.
+        """
+        if get_ident() == self._loop_thread_id:
+            self._queue.put_nowait(event)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def get_tracer(self) -> LatencyTracer | None:
+        """
+        Latency tracing is not supported by asyncio engine.
+        """
+        return None
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get event loop which events are dispatched on.
+        """
+        return self._loop
+
+    def register(self, type: str, handler: AsyncHandlerType) -> None:
+        """
+        Register a new handler function for a specific event type. Every
+        function can only be registered once for each event type.
+        """
+        with self._register_lock:
+            handler_set: dict = self._handler_sets.setdefault(type, {})
+
+            if handler not in handler_set:
+                handler_set[handler] = None
+                self._handlers[type] = tuple(handler_set)
+
+    def unregister(self, type: str, handler: AsyncHandlerType) -> None:
+        """
+        Unregister an existing handler function from event engine.
+
+        It is safe to be called during dispatching, the event being
+        processed is still distributed to the snapshot of handlers.
+        """
+        with self._register_lock:
+            handler_set: dict | None = self._handler_sets.get(type, None)
+            if handler_set is None:
+                return
+
+            handler_set.pop(handler, None)
+
+            if handler_set:
+                self._handlers[type] = tuple(handler_set)
+            else:
+                self._handler_sets.pop(type)
+                self._handlers.pop(type, None)
+
+    def register_prefix(self, prefix: str, handler: AsyncHandlerType) -> None:
+        """
+        Register a new handler function for all events whose type + key
+        starts with prefix, the same as EventEngine.
+        """
+        with self._register_lock:
+            handler_set: dict = self._prefix_handler_sets.setdefault(prefix, {})
+
+            if handler not in handler_set:
+                handler_set[handler] = None
+                self._update_prefix_handlers()
+
+    def unregister_prefix(self, prefix: str, handler: AsyncHandlerType) -> None:
+        """
+        Unregister an existing prefix handler function.
+        """
+        with self._register_lock:
+            handler_set: dict | None = self._prefix_handler_sets.get(prefix, None)
+            if handler_set is None:
+                return
+
+            handler_set.pop(handler, None)
+
+            if not handler_set:
+                self._prefix_handler_sets.pop(prefix)
+
+            self._update_prefix_handlers()
+
+    def _update_prefix_handlers(self) -> None:
+        """
+        Rebuild snapshot of prefix handlers.
+        """
+        self._prefix_handlers = tuple(
+            (prefix, tuple(handler_set))
+            for prefix, handler_set in self._prefix_handler_sets.items()
+        )
+
+    def register_general(self, handler: AsyncHandlerType) -> None:
+        """
+        Register a new handler function for all event types. Every
+        function can only be registered once for each event type.
+        """
+        with self._register_lock:
+            if handler not in self._general_handler_set:
+                self._general_handler_set[handler] = None
+                self._general_handlers = tuple(self._general_handler_set)
+
+    def unregister_general(self, handler: AsyncHandlerType) -> None:
+        """
+        Unregister an existing general handler function.
+        """
+        with self._register_lock:
+            if handler in self._general_handler_set:
+                self._general_handler_set.pop(handler)
+                self._general_handlers = tuple(self._general_handler_set)
@@ -2,15 +2,22 @@
 Event-driven framework of VeighNa framework.
 """
 
-from collections import defaultdict
-from collections.abc import Callable
-from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any
+from collections import deque
+from collections.abc import Callable, Iterable
+from enum import Enum
+from queue import Empty, Full, Queue
+from threading import Lock, Thread, Event as ThreadEvent, get_ident
+from time import monotonic, perf_counter_ns
+from typing import Any, cast
+
+from .profiler import HandlerProfiler
+from .tracer import LatencyTracer, Trace
 
 
 EVENT_TIMER = "eTimer"
+EVENT_BATCH = "eBatch"
+EVENT_PROFILE = "eProfile"
+EVENT_QUEUE_ALERT = "eQueueAlert"
 
 
 class Event:
@@ -18,18 +25,410 @@ class Event:
     Event object consists of a type string which is used
     by event engine for distributing event, and a data
     object which contains the real data.
+
+    An optional key (vt_symbol, vt_orderid, etc.) can be attached, then
+    the event is distributed to handlers of both type and type + key,
+    so that publishing a single event is enough for both of them.
     """
 
-    def __init__(self, type: str, data: Any = None) -> None:
+    # Timestamp (perf_counter_ns) of putting into queue, only set when
+    # handler profiling is enabled in event engine.
+    put_time: int = 0
+
+    # Latency trace of the event, only set by producers (such as gateway
+    # pushing tick) when latency tracing is enabled in event engine.
+    trace: Trace | None = None
+
+    def __init__(self, type: str, data: Any = None, key: str = "") -> None:
         """"""
         self.type: str = type
         self.data: Any = data
+        self.key: str = key
 
 
 # Defines handler function to be used in event engine.
 HandlerType = Callable[[Event], None]
 
 
+class TimerPolicy(Enum):
+    """
+    Policy of timer channel for ticks missed when timer thread is late.
+    """
+    CATCHUP = "catchup"     # generate every missed timer event
+    SKIP = "skip"           # generate one timer event and skip the others
+
+
+class TimerChannel:
+    """
+    Timer channel generates timer event of its type every interval
+    seconds, scheduled on monotonic clock without drift.
+    """
+
+    def __init__(self, type: str, interval: float, policy: TimerPolicy) -> None:
+        """"""
+        self.type: str = type
+        self.interval: float = interval
+        self.policy: TimerPolicy = policy
+        self.next_time: float = monotonic() + interval
+
+
+class OverflowPolicy(Enum):
+    """
+    Policy of bounded event queue when it is full.
+    """
+    BLOCK = "block"     # block the producer until there is free space
+    DROP = "drop"       # drop the oldest event of droppable types
+    RAISE = "raise"     # raise queue.Full to the producer
+
+
+class EventQueue(Queue):
+    """
+    Event queue which supports draining all queued events
+    with a single lock acquisition.
+
+    When maxsize is larger than 0, the queue is bounded and handles
+    overflow according to the policy. With OverflowPolicy.DROP, the
+    oldest queued event of drop_types is discarded to make room. If no
+    such event is queued, a new event of drop_types is discarded, while
+    other events (order, trade, etc.) are still accepted over maxsize.
+
+    Events put with force are accepted over maxsize with any policy
+    except DROP, which is used for events put by consumer thread itself
+    that would otherwise deadlock with OverflowPolicy.BLOCK.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        drop_types: Iterable[str] = ()
+    ) -> None:
+        """"""
+        self._overflow: OverflowPolicy = overflow
+        self._drop_types: tuple[str, ...] = tuple(drop_types)
+
+        super().__init__(maxsize)
+
+        # Number of events dropped without being delivered
+        self.dropped: int = 0
+
+        # Highest queue length reached since last pop_high_water
+        self.high_water: int = 0
+
+        # Batch statistics since last pop_statistics
+        self._batch_count: int = 0
+        self._event_count: int = 0
+        self._batch_max: int = 0
+        self._depth_max: int = 0
+
+    def put(
+        self,
+        item: Event,
+        block: bool = True,
+        timeout: float | None = None,
+        force: bool = False
+    ) -> None:
+        """
+        Put an event into queue, handling overflow of bounded queue
+        according to its policy.
+        """
+        if self.maxsize <= 0:
+            super().put(item, block, timeout)
+            return
+
+        if force and self._overflow != OverflowPolicy.DROP:
+            with self.not_full:
+                self._put(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+        elif self._overflow == OverflowPolicy.BLOCK:
+            super().put(item, block, timeout)
+        elif self._overflow == OverflowPolicy.RAISE:
+            super().put(item, block=False)
+        else:
+            with self.not_full:
+                if self._qsize() >= self.maxsize and not self._remove_droppable():
+                    if item.type.startswith(self._drop_types):
+                        self.dropped += 1
+                        return
+
+                self._put(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+
+        size: int = self._qsize()
+        if size > self.high_water:
+            self.high_water = size
+
+    def pop_high_water(self) -> int:
+        """
+        Get highest queue length since last call and then reset it.
+        """
+        with self.mutex:
+            high_water: int = max(self.high_water, self._qsize())
+            self.high_water = 0
+
+        return high_water
+
+    def _remove_droppable(self) -> bool:
+        """
+        Remove the oldest queued event of drop types.
+        """
+        return self._remove_from(self.queue)
+
+    def _remove_from(self, items: deque) -> bool:
+        """
+        Remove the oldest event of drop types from items.
+        """
+        if not self._drop_types:
+            return False
+
+        for i, item in enumerate(items):
+            event: Event = item[0] if type(item) is list else item
+
+            if event.type.startswith(self._drop_types):
+                del items[i]
+                self._discard(item)
+                self.dropped += 1
+                return True
+
+        return False
+
+    def _discard(self, item: Event | list) -> None:
+        """
+        Callback when an item is removed from queue without being delivered.
+        """
+        pass
+
+    def get_batch(self, max_size: int, timeout: float) -> tuple[list, int]:
+        """
+        Block until at least one event is available, then take up to
+        max_size events already queued without blocking again.
+
+        Return the batch of events and the queue depth left behind.
+        """
+        with self.not_empty:
+            if not self._qsize():
+                endtime: float = monotonic() + timeout
+
+                while not self._qsize():
+                    remaining: float = endtime - monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self.not_empty.wait(remaining)
+
+            size: int = min(self._qsize(), max_size)
+            events: list = [self._get() for _ in range(size)]
+            depth: int = self._qsize()
+
+            self._batch_count += 1
+            self._event_count += size
+            if size > self._batch_max:
+                self._batch_max = size
+            if depth > self._depth_max:
+                self._depth_max = depth
+
+            self.not_full.notify(size)
+
+        return events, depth
+
+    def pop_statistics(self) -> dict:
+        """
+        Get batch statistics since last call and then reset them.
+        """
+        with self.mutex:
+            statistics: dict = {
+                "batch_count": self._batch_count,
+                "event_count": self._event_count,
+                "batch_max": self._batch_max,
+                "depth_max": self._depth_max,
+                "depth": self._qsize(),
+            }
+
+            self._batch_count = 0
+            self._event_count = 0
+            self._batch_max = 0
+            self._depth_max = 0
+
+        return statistics
+
+
+class CoalescingEventQueue(EventQueue):
+    """
+    Event queue which keeps only the latest undelivered event for
+    each (type, vt_symbol) key of the coalescable event types.
+
+    A newer event replaces the queued one at its original position,
+    so non-coalescable events (order, trade, etc.) keep their order
+    and the queue length is bounded by number of symbols under backlog.
+    """
+
+    def __init__(
+        self,
+        coalesce_types: Iterable[str],
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        drop_types: Iterable[str] = ()
+    ) -> None:
+        """"""
+        self._coalesce_types: tuple[str, ...] = tuple(coalesce_types)
+
+        super().__init__(maxsize, overflow, drop_types)
+
+    def _init(self, maxsize: int) -> None:
+        """"""
+        super()._init(maxsize)
+
+        # Key: (type, vt_symbol), value: [event, key] slot in queue
+        self._slots: dict[tuple, list] = {}
+
+    def _put(self, event: Event) -> None:
+        """"""
+        if not event.type.startswith(self._coalesce_types):
+            self._append(event, event)
+            return
+
+        key: tuple = (event.type, getattr(event.data, "vt_symbol", None))
+        slot: list | None = self._slots.get(key, None)
+
+        if slot:
+            slot[0] = event
+            self.dropped += 1
+        else:
+            slot = [event, key]
+            self._slots[key] = slot
+            self._append(slot, event)
+
+    def _get(self) -> Event:
+        """"""
+        item: Event | list = self._pop()
+
+        if type(item) is list:
+            self._slots.pop(item[1])
+            return cast(Event, item[0])
+
+        return cast(Event, item)
+
+    def _discard(self, item: Event | list) -> None:
+        """"""
+        if type(item) is list:
+            self._slots.pop(item[1])
+
+    def _append(self, item: Event | list, event: Event) -> None:
+        """
+        Append event or coalescing slot of event into queue.
+        """
+        self.queue.append(item)
+
+    def _pop(self) -> Event | list:
+        """
+        Pop next event or coalescing slot from queue.
+        """
+        item: Event | list = self.queue.popleft()
+        return item
+
+
+class PriorityEventQueue(CoalescingEventQueue):
+    """
+    Event queue with several priority lanes, each of which is a FIFO.
+
+    Priority of event is decided by the prefix of its type up to and
+    including the first ".", for example "eOrder." for both EVENT_ORDER
+    and EVENT_ORDER + vt_orderid. Lower number means higher priority,
+    and types not configured use DEFAULT_PRIORITY.
+
+    To avoid starvation, after starvation_limit events taken in a row
+    from higher lanes while lower lanes are waiting, one event is taken
+    from the lower lanes in turn.
+    """
+
+    DEFAULT_PRIORITY: int = 1
+
+    def __init__(
+        self,
+        priorities: dict[str, int],
+        coalesce_types: Iterable[str] = (),
+        starvation_limit: int = 100,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        drop_types: Iterable[str] = ()
+    ) -> None:
+        """"""
+        self._priorities: dict[str, int] = dict(priorities)
+        self._lane_count: int = max([self.DEFAULT_PRIORITY, *priorities.values()]) + 1
+        self._starvation_limit: int = starvation_limit
+
+        super().__init__(coalesce_types, maxsize, overflow, drop_types)
+
+    def _init(self, maxsize: int) -> None:
+        """"""
+        super()._init(maxsize)
+
+        self._lanes: list[deque] = [deque() for _ in range(self._lane_count)]
+        self._size: int = 0
+        self._starved: int = 0
+        self._guard_lane: int = 0
+
+    def _qsize(self) -> int:
+        """"""
+        return self._size
+
+    def _append(self, item: Event | list, event: Event) -> None:
+        """"""
+        head, sep, _ = event.type.partition(".")
+        priority: int = self._priorities.get(head + sep, self.DEFAULT_PRIORITY)
+
+        self._lanes[priority].append(item)
+        self._size += 1
+
+    def _pop(self) -> Event | list:
+        """"""
+        self._size -= 1
+
+        item: Event | list = self._lanes[self._select_lane()].popleft()
+        return item
+
+    def _remove_droppable(self) -> bool:
+        """
+        Remove the oldest event of drop types, starting from the lowest lane.
+        """
+        for lane in reversed(self._lanes):
+            if self._remove_from(lane):
+                self._size -= 1
+                return True
+
+        return False
+
+    def _select_lane(self) -> int:
+        """
+        Select the lane to take next event from.
+        """
+        lanes: list[deque] = self._lanes
+
+        first: int = 0
+        while not lanes[first]:
+            first += 1
+
+        # No event waiting in lower lanes
+        if len(lanes[first]) > self._size:
+            self._starved = 0
+            return first
+
+        self._starved += 1
+        if self._starved <= self._starvation_limit:
+            return first
+        self._starved = 0
+
+        # Take lower lanes in turn to avoid starving any of them
+        for i in range(1, self._lane_count):
+            lane: int = (self._guard_lane + i) % self._lane_count
+            if lane > first and lanes[lane]:
+                self._guard_lane = lane
+                return lane
+
+        return first
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type
@@ -39,52 +438,373 @@ class EventEngine:
     which can be used for timing purpose.
     """
 
-    def __init__(self, interval: int = 1) -> None:
+    def __init__(
+        self,
+        interval: float = 1,
+        batch_size: int = 1,
+        coalesce_types: Iterable[str] | None = None,
+        profile_interval: int = 0,
+        priorities: dict[str, int] | None = None,
+        starvation_limit: int = 100,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        drop_types: Iterable[str] | None = None,
+        alert_level: float = 0.8,
+        tracing: bool = False
+    ) -> None:
         """
         Timer event is generated every 1 second by default, if
-        interval not specified.
+        interval not specified. Sub-second interval is supported, and
+        more timer channels can be added by add_timer.
+
+        Batched drain mode is enabled when batch_size is larger than 1:
+        the engine blocks for the first event, then takes up to
+        batch_size events already queued in one pass, and reports the
+        batch statistics with an EVENT_BATCH event every timer interval.
+
+        Event types starting with any prefix in coalesce_types (for
+        example EVENT_TICK) are coalesced per vt_symbol in the queue,
+        so that only the latest undelivered one is processed.
+
+        Handler profiling is enabled when profile_interval is larger
+        than 0: call count and wall time of every handler, as well as
+        queue wait time of events are recorded, and an EVENT_PROFILE
+        summary is generated every profile_interval timer events.
+
+        Priority lanes are enabled when priorities is passed in, which
+        maps event type prefix (for example EVENT_ORDER) to priority
+        number (lower is more urgent). Lower lanes are still served
+        once every starvation_limit events when higher lanes are busy.
+
+        Event queue is bounded when maxsize is larger than 0, and the
+        overflow policy decides whether to block the producer, drop the
+        oldest events of drop_types (for example EVENT_TICK), or raise
+        queue.Full. Events put by handlers in event thread are accepted
+        over maxsize instead of blocking or raising, unless dropped. An
+        EVENT_QUEUE_ALERT event is generated when queue length crosses
+        alert_level of maxsize within a timer interval.
+
+        Latency tracing is enabled when tracing is True: events carrying
+        a trace are stamped at enqueue, dequeue, and entry and exit of
+        every handler, see get_tracer.
         """
-        self._interval: int = interval
-        self._queue: Queue = Queue()
+        self._interval: float = interval
+        self._batch_size: int = batch_size
+        self._coalesce_types: tuple[str, ...] = tuple(coalesce_types or ())
+        self._priorities: dict[str, int] | None = priorities
+        self._starvation_limit: int = starvation_limit
+        self._maxsize: int = maxsize
+        self._overflow: OverflowPolicy = overflow
+        self._drop_types: tuple[str, ...] = tuple(drop_types or ())
+        self._alert_level: float = alert_level
+        self._alerted: bool = False
+        self._queue_statistics: dict = {}
+
+        self._queue: EventQueue = self._create_queue()
+        self._queues: list[EventQueue] = [self._queue]
+
         self._active: bool = False
-        self._thread: Thread = Thread(target=self._run)
+        self._thread: Thread = Thread(target=self._run, args=(self._queue,))
+
+        # Ident of threads consuming event queues, events put by handlers
+        # in these threads never block on full queue
+        self._consumers: set[int] = set()
         self._timer: Thread = Thread(target=self._run_timer)
-        self._handlers: defaultdict = defaultdict(list)
-        self._general_handlers: list = []
+        self._timer_wakeup: ThreadEvent = ThreadEvent()
+        self._timer_channels: dict[str, TimerChannel] = {
+            "": TimerChannel(EVENT_TIMER, interval, TimerPolicy.SKIP)
+        }
+        # Handlers are kept in insertion-ordered dicts used as sets, and
+        # immutable tuple snapshots of them are used for dispatching.
+        self._handler_sets: dict[str, dict[HandlerType, None]] = {}
+        self._handlers: dict[str, tuple[HandlerType, ...]] = {}
+        self._general_handler_set: dict[HandlerType, None] = {}
+        self._general_handlers: tuple[HandlerType, ...] = ()
+        self._prefix_handler_sets: dict[str, dict[HandlerType, None]] = {}
+        self._prefix_handlers: tuple[tuple[str, tuple[HandlerType, ...]], ...] = ()
+        self._register_lock: Lock = Lock()
+
+        self._batch_statistics: dict = {}
+
+        self._profile_interval: int = profile_interval
+        self._profile_count: int = 0
+        self._profiler: HandlerProfiler | None = None
+
+        self._tracer: LatencyTracer | None = None
+        if tracing:
+            self._tracer = LatencyTracer()
+
+        if self._batch_size > 1:
+            self.register(EVENT_TIMER, self._process_batch_timer)
+
+        if self._profile_interval > 0:
+            self._profiler = HandlerProfiler()
+            self.register(EVENT_TIMER, self._process_profile_timer)
+
+        if self._maxsize > 0:
+            self.register(EVENT_TIMER, self._process_queue_timer)
 
-    def _run(self) -> None:
+    def _create_queue(self) -> EventQueue:
+        """
+        Create event queue according to engine setting.
+        """
+        if self._priorities:
+            return PriorityEventQueue(
+                self._priorities,
+                self._coalesce_types,
+                self._starvation_limit,
+                self._maxsize,
+                self._overflow,
+                self._drop_types
+            )
+        elif self._coalesce_types:
+            return CoalescingEventQueue(
+                self._coalesce_types,
+                self._maxsize,
+                self._overflow,
+                self._drop_types
+            )
+        else:
+            return EventQueue(self._maxsize, self._overflow, self._drop_types)
+
+    def _run(self, queue: EventQueue) -> None:
         """
         Get event from queue and then process it.
         """
+        self._consumers.add(get_ident())
+
+        if self._batch_size > 1:
+            self._run_batch(queue)
+            return
+
+        process: Callable = self._get_process()
+
         while self._active:
             try:
-                event: Event = self._queue.get(block=True, timeout=1)
-                self._process(event)
+                event: Event = queue.get(block=True, timeout=1)
+                process(event)
             except Empty:
                 pass
 
+    def _run_batch(self, queue: EventQueue) -> None:
+        """
+        Drain all queued events in batch and then process them in one pass.
+        """
+        get_batch: Callable = queue.get_batch
+        process: Callable = self._get_process()
+        batch_size: int = self._batch_size
+
+        while self._active:
+            try:
+                events, _ = get_batch(batch_size, 1)
+            except Empty:
+                continue
+
+            for event in events:
+                process(event)
+
+    def _process_batch_timer(self, event: Event) -> None:
+        """
+        Report batch statistics of last timer interval and reset them.
+        """
+        statistics: dict = {
+            "batch_count": 0,
+            "event_count": 0,
+            "batch_max": 0,
+            "depth_max": 0,
+            "depth": 0,
+        }
+
+        for queue in self._queues:
+            queue_statistics: dict = queue.pop_statistics()
+
+            statistics["batch_count"] += queue_statistics["batch_count"]
+            statistics["event_count"] += queue_statistics["event_count"]
+            statistics["depth"] += queue_statistics["depth"]
+            statistics["batch_max"] = max(statistics["batch_max"], queue_statistics["batch_max"])
+            statistics["depth_max"] = max(statistics["depth_max"], queue_statistics["depth_max"])
+
+        if statistics["batch_count"]:
+            statistics["batch_avg"] = statistics["event_count"] / statistics["batch_count"]
+        else:
+            statistics["batch_avg"] = 0
+
+        self._batch_statistics = statistics
+        self._put_nowait(Event(EVENT_BATCH, statistics))
+
+    def _get_process(self) -> Callable[[Event], None]:
+        """
+        Get the function used for processing event, so that no profiling
+        overhead is added when it is not enabled.
+        """
+        if self._tracer:
+            return self._process_traced
+        elif self._profiler:
+            return self._process_profiled
+        else:
+            return self._process
+
     def _process(self, event: Event) -> None:
         """
         First distribute event to those handlers registered listening
-        to this type.
+        to this type, and to type + key if event has key.
+
+        Then distribute event to those prefix handlers whose prefix
+        matches type + key of event.
 
-        Then distribute event to those general handlers which listens
+        At last distribute event to those general handlers which listens
         to all types.
         """
-        if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+        handlers: tuple | None = self._handlers.get(event.type, None)
+        if handlers:
+            for handler in handlers:
+                handler(event)
+
+        if event.key:
+            handlers = self._handlers.get(event.type + event.key, None)
+            if handlers:
+                for handler in handlers:
+                    handler(event)
+
+        if self._prefix_handlers:
+            full_type: str = event.type + event.key
+            for prefix, handlers in self._prefix_handlers:
+                if full_type.startswith(prefix):
+                    for handler in handlers:
+                        handler(event)
+
+        for handler in self._general_handlers:
+            handler(event)
+
+    def _get_handlers(self, event: Event) -> tuple:
+        """
+        Get all handlers which event is distributed to, in the same
+        order as _process.
+        """
+        handlers: tuple = self._handlers.get(event.type, ())
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        if event.key:
+            handlers += self._handlers.get(event.type + event.key, ())
+
+        full_type: str = event.type + event.key
+        for prefix, prefix_handlers in self._prefix_handlers:
+            if full_type.startswith(prefix):
+                handlers += prefix_handlers
+
+        return handlers + self._general_handlers
+
+    def _process_profiled(self, event: Event) -> None:
+        """
+        Distribute event the same as _process, while recording queue wait
+        time of the event and wall time of every handler.
+        """
+        profiler: HandlerProfiler = self._profiler      # type: ignore
+
+        if event.put_time:
+            profiler.record_wait(perf_counter_ns() - event.put_time)
+
+        for handler in self._get_handlers(event):
+            start: int = perf_counter_ns()
+            handler(event)
+            profiler.record_handler(handler, perf_counter_ns() - start)
+
+    def _process_traced(self, event: Event) -> None:
+        """
+        Distribute event carrying a trace while stamping dequeue, and
+        entry and exit of every handler. The trace is set as current one
+        of the thread, so that order sent by handler can be stamped.
+        """
+        trace: Trace | None = event.trace
+
+        if not trace:
+            if self._profiler:
+                self._process_profiled(event)
+            else:
+                self._process(event)
+            return
+
+        tracer: LatencyTracer = self._tracer        # type: ignore
+        tracer.stamp(trace, "dequeue")
+        tracer.set_current(trace)
+
+        try:
+            for handler in self._get_handlers(event):
+                tracer.stamp(trace, "handler_enter")
+                handler(event)
+                tracer.stamp(trace, "handler_exit:" + getattr(handler, "__qualname__", repr(handler)))
+        finally:
+            tracer.set_current(None)
+
+    def _process_profile_timer(self, event: Event) -> None:
+        """
+        Generate profile summary and then reset profiler every
+        profile_interval timer events.
+        """
+        self._profile_count += 1
+        if self._profile_count < self._profile_interval:
+            return
+        self._profile_count = 0
+
+        profiler: HandlerProfiler = self._profiler      # type: ignore
+        snapshot: dict = profiler.get_snapshot(reset=True)
+
+        self._put_nowait(Event(EVENT_PROFILE, snapshot))
+
+    def _process_queue_timer(self, event: Event) -> None:
+        """
+        Check high water mark of bounded queue in last timer interval,
+        and generate alert event when it crosses alert level.
+        """
+        statistics: dict = {
+            "maxsize": self._maxsize,
+            "depth": sum(queue.qsize() for queue in self._queues),
+            "high_water": max(queue.pop_high_water() for queue in self._queues),
+            "dropped": self.get_dropped_count(),
+        }
+        self._queue_statistics = statistics
+
+        alerted: bool = statistics["high_water"] >= self._maxsize * self._alert_level
+
+        if alerted and not self._alerted:
+            self._put_nowait(Event(EVENT_QUEUE_ALERT, statistics))
+
+        self._alerted = alerted
 
     def _run_timer(self) -> None:
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Wait until next scheduled time of timer channels and then
+        generate timer events of those channels which are due.
         """
+        start: float = monotonic()
+        for channel in list(self._timer_channels.values()):
+            channel.next_time = start + channel.interval
+
         while self._active:
-            sleep(self._interval)
-            event: Event = Event(EVENT_TIMER)
-            self.put(event)
+            now: float = monotonic()
+            next_time: float = now + 1
+
+            for channel in list(self._timer_channels.values()):
+                if now >= channel.next_time:
+                    self._trigger_timer(channel, now)
+
+                next_time = min(next_time, channel.next_time)
+
+            self._timer_wakeup.wait(next_time - monotonic())
+            self._timer_wakeup.clear()
+
+    def _trigger_timer(self, channel: TimerChannel, now: float) -> None:
+        """
+        Generate timer event(s) of channel according to its policy.
+        """
+        if channel.policy == TimerPolicy.CATCHUP:
+            while channel.next_time <= now:
+                self._put_nowait(Event(channel.type))
+                channel.next_time += channel.interval
+        else:
+            self._put_nowait(Event(channel.type))
+
+            missed: int = int((now - channel.next_time) // channel.interval)
+            channel.next_time += (missed + 1) * channel.interval
 
     def start(self) -> None:
         """
@@ -99,47 +819,184 @@ class EventEngine:
         Stop event engine.
         """
         self._active = False
+        self._timer_wakeup.set()
         self._timer.join()
         self._thread.join()
 
-    def put(self, event: Event) -> None:
+    def put(self, event: Event, block: bool = True) -> None:
         """
         Put an event object into event queue.
         """
-        self._queue.put(event)
+        if self._profiler:
+            event.put_time = perf_counter_ns()
+
+        if event.trace and self._tracer:
+            self._tracer.stamp(event.trace, "enqueue")
+
+        # Only bounded queue needs to check the thread putting event
+        force: bool = self._maxsize > 0 and get_ident() in self._consumers
+        self._queue.put(event, block, force=force)
+
+    def _put_nowait(self, event: Event) -> None:
+        """
+        Put an event generated by engine itself without blocking, and
+        discard it if the bounded queue is full.
+        """
+        try:
+            self.put(event, False)
+        except Full:
+            pass
+
+    def add_timer(
+        self,
+        name: str,
+        interval: float,
+        policy: TimerPolicy = TimerPolicy.SKIP
+    ) -> str:
+        """
+        Add a named timer channel which generates timer event every
+        interval seconds, and return the event type of the channel
+        (EVENT_TIMER + "." + name).
+
+        Empty name is reserved for the default channel of EVENT_TIMER.
+        """
+        if not name:
+            raise ValueError("Timer name cannot be empty")
+
+        type: str = f"{EVENT_TIMER}.{name}"
+        self._timer_channels[name] = TimerChannel(type, interval, policy)
+        self._timer_wakeup.set()
+        return type
+
+    def remove_timer(self, name: str) -> None:
+        """
+        Remove a named timer channel.
+        """
+        if name:
+            self._timer_channels.pop(name, None)
+
+    def get_batch_statistics(self) -> dict:
+        """
+        Get batch statistics of last timer interval.
+        """
+        return self._batch_statistics
+
+    def get_profile_snapshot(self) -> dict:
+        """
+        Get handler profiling data recorded since last summary.
+        """
+        if not self._profiler:
+            return {}
+        return self._profiler.get_snapshot()
+
+    def get_queue_statistics(self) -> dict:
+        """
+        Get length, high water mark and dropped count of bounded queue
+        in last timer interval.
+        """
+        return self._queue_statistics
+
+    def get_tracer(self) -> LatencyTracer | None:
+        """
+        Get latency tracer, which is None if tracing is not enabled.
+        """
+        return self._tracer
+
+    def get_dropped_count(self) -> int:
+        """
+        Get number of events dropped by the event queue without being
+        processed, such as ticks replaced by coalescing.
+        """
+        return sum(queue.dropped for queue in self._queues)
 
     def register(self, type: str, handler: HandlerType) -> None:
         """
         Register a new handler function for a specific event type. Every
         function can only be registered once for each event type.
         """
-        handler_list: list = self._handlers[type]
-        if handler not in handler_list:
-            handler_list.append(handler)
+        with self._register_lock:
+            handler_set: dict = self._handler_sets.setdefault(type, {})
+
+            if handler not in handler_set:
+                handler_set[handler] = None
+                self._handlers[type] = tuple(handler_set)
 
     def unregister(self, type: str, handler: HandlerType) -> None:
         """
         Unregister an existing handler function from event engine.
+
+        It is safe to be called during dispatching, the event being
+        processed is still distributed to the snapshot of handlers.
+        """
+        with self._register_lock:
+            handler_set: dict | None = self._handler_sets.get(type, None)
+            if handler_set is None:
+                return
+
+            handler_set.pop(handler, None)
+
+            if handler_set:
+                self._handlers[type] = tuple(handler_set)
+            else:
+                self._handler_sets.pop(type)
+                self._handlers.pop(type, None)
+
+    def register_prefix(self, prefix: str, handler: HandlerType) -> None:
+        """
+        Register a new handler function for all events whose type + key
+        starts with prefix, for example EVENT_TICK + "rb" for ticks of
+        all rb contracts.
+
+        Note that gateways publishing both general and specific events
+        (old style) make the handler of a general prefix called twice.
         """
-        handler_list: list = self._handlers[type]
+        with self._register_lock:
+            handler_set: dict = self._prefix_handler_sets.setdefault(prefix, {})
 
-        if handler in handler_list:
-            handler_list.remove(handler)
+            if handler not in handler_set:
+                handler_set[handler] = None
+                self._update_prefix_handlers()
 
-        if not handler_list:
-            self._handlers.pop(type)
+    def unregister_prefix(self, prefix: str, handler: HandlerType) -> None:
+        """
+        Unregister an existing prefix handler function.
+        """
+        with self._register_lock:
+            handler_set: dict | None = self._prefix_handler_sets.get(prefix, None)
+            if handler_set is None:
+                return
+
+            handler_set.pop(handler, None)
+
+            if not handler_set:
+                self._prefix_handler_sets.pop(prefix)
+
+            self._update_prefix_handlers()
+
+    def _update_prefix_handlers(self) -> None:
+        """
+        Rebuild snapshot of prefix handlers.
+        """
+        self._prefix_handlers = tuple(
+            (prefix, tuple(handler_set))
+            for prefix, handler_set in self._prefix_handler_sets.items()
+        )
 
     def register_general(self, handler: HandlerType) -> None:
         """
         Register a new handler function for all event types. Every
         function can only be registered once for each event type.
         """
-        if handler not in self._general_handlers:
-            self._general_handlers.append(handler)
+        with self._register_lock:
+            if handler not in self._general_handler_set:
+                self._general_handler_set[handler] = None
+                self._general_handlers = tuple(self._general_handler_set)
 
     def unregister_general(self, handler: HandlerType) -> None:
         """
         Unregister an existing general handler function.
         """
-        if handler in self._general_handlers:
-            self._general_handlers.remove(handler)
+        with self._register_lock:
+            if handler in self._general_handler_set:
+                self._general_handler_set.pop(handler)
+                self._general_handlers = tuple(self._general_handler_set)
@@ -0,0 +1,161 @@
+"""
+Handler latency profiler used by event engine.
+"""
+
+from collections.abc import Callable
+from threading import Lock
+
+
+# Values below this are recorded exactly, above it every power of 2
+# is split into 4 sub-buckets, which gives 25% resolution at most.
+EXACT_LIMIT: int = 8
+BUCKET_COUNT: int = 256
+
+
+def get_bucket(value: int) -> int:
+    """
+    Get histogram bucket index of value.
+    """
+    if value < EXACT_LIMIT:
+        return value
+
+    shift: int = value.bit_length() - 3
+    return (shift << 2) + (value >> shift)
+
+
+def get_bucket_limit(bucket: int) -> int:
+    """
+    Get the largest value recorded into bucket.
+    """
+    if bucket < EXACT_LIMIT:
+        return bucket
+
+    shift: int = (bucket >> 2) - 1
+    base: int = (bucket & 3) + 4
+    return ((base + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latency in nanoseconds.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+        self.total: int = 0
+        self.max: int = 0
+        self.buckets: list[int] = [0] * BUCKET_COUNT
+
+    def record(self, value: int) -> None:
+        """
+        Record a latency value.
+        """
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+        self.buckets[get_bucket(value)] += 1
+
+    def get_percentile(self, percent: float) -> int:
+        """
+        Get upper limit of the latency at percentile (0-100).
+        """
+        if not self.count:
+            return 0
+
+        target: float = self.count * percent / 100
+        cumulative: int = 0
+
+        for bucket, n in enumerate(self.buckets):
+            cumulative += n
+            if n and cumulative >= target:
+                return min(get_bucket_limit(bucket), self.max)
+
+        return self.max
+
+    def get_summary(self) -> dict:
+        """
+        Get summary of histogram with latency in microseconds.
+        """
+        if self.count:
+            mean: float = self.total / self.count / 1000
+        else:
+            mean = 0
+
+        return {
+            "count": self.count,
+            "mean": mean,
+            "p50": self.get_percentile(50) / 1000,
+            "p99": self.get_percentile(99) / 1000,
+            "max": self.max / 1000,
+        }
+
+
+class HandlerProfiler:
+    """
+    Records call count and wall time of every handler, as well as
+    the time events spent waiting in queue before being dispatched.
+
+    Recording is guarded by lock, since handlers may be called from
+    several worker threads of sharded engine.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.handler_histograms: dict[Callable, LatencyHistogram] = {}
+        self.wait_histogram: LatencyHistogram = LatencyHistogram()
+        self.lock: Lock = Lock()
+
+    def record_handler(self, handler: Callable, value: int) -> None:
+        """
+        Record wall time of one handler call.
+        """
+        with self.lock:
+            histogram: LatencyHistogram | None = self.handler_histograms.get(handler, None)
+
+            if not histogram:
+                histogram = LatencyHistogram()
+                self.handler_histograms[handler] = histogram
+
+            histogram.record(value)
+
+    def record_wait(self, value: int) -> None:
+        """
+        Record time from put to dispatch of one event.
+        """
+        with self.lock:
+            self.wait_histogram.record(value)
+
+    def get_snapshot(self, reset: bool = False) -> dict:
+        """
+        Get summary of queue wait time and all handlers, and clear
+        recorded data at the same time if reset is True.
+        """
+        with self.lock:
+            handler_histograms: dict[Callable, LatencyHistogram] = self.handler_histograms
+            wait_histogram: LatencyHistogram = self.wait_histogram
+
+            if reset:
+                self.handler_histograms = {}
+                self.wait_histogram = LatencyHistogram()
+
+            handlers: dict[str, dict] = {}
+
+            for handler, histogram in handler_histograms.items():
+                name: str = getattr(handler, "__qualname__", repr(handler))
+                handlers[name] = histogram.get_summary()
+
+            return {
+                "queue_wait": wait_histogram.get_summary(),
+                "handlers": handlers,
+            }
+
+    def reset(self) -> None:
+        """
+        Clear all recorded data.
+        """
+        with self.lock:
+            self.handler_histograms = {}
+            self.wait_histogram = LatencyHistogram()
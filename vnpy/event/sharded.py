@@ -0,0 +1,120 @@
+"""
+Sharded event engine which distributes events onto multiple worker threads.
+"""
+
+from collections.abc import Callable, Iterable
+from threading import Thread, get_ident
+from time import perf_counter_ns
+
+from .engine import Event, EventEngine, EventQueue, OverflowPolicy
+
+
+def get_routing_key(event: Event) -> str:
+    """
+    Get routing key of event.
+
+    The vt_symbol of event data is used if available, so that all events
+    of one symbol (tick, order, trade, position) stay on the same worker,
+    which also keeps events of each vt_orderid in order. Otherwise the key
+    attached to event, or the suffix appended to event type (vt_accountid,
+    etc.) is used, and event type itself at last.
+    """
+    vt_symbol: str | None = getattr(event.data, "vt_symbol", None)
+    if vt_symbol:
+        return vt_symbol
+
+    if event.key:
+        return event.key
+
+    return event.type.partition(".")[2] or event.type
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine which hashes events by routing key onto several
+    worker threads, each of which has its own event queue.
+
+    Events with the same routing key are always processed by the same
+    worker, so their order is kept. Events with different keys may be
+    processed concurrently, so handlers must be thread-safe.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1,
+        batch_size: int = 1,
+        coalesce_types: Iterable[str] | None = None,
+        profile_interval: int = 0,
+        priorities: dict[str, int] | None = None,
+        starvation_limit: int = 100,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        drop_types: Iterable[str] | None = None,
+        alert_level: float = 0.8,
+        tracing: bool = False,
+        worker_count: int = 4,
+        key_func: Callable[[Event], str] = get_routing_key
+    ) -> None:
+        """"""
+        super().__init__(
+            interval,
+            batch_size,
+            coalesce_types,
+            profile_interval,
+            priorities,
+            starvation_limit,
+            maxsize,
+            overflow,
+            drop_types,
+            alert_level,
+            tracing
+        )
+
+        self._worker_count: int = worker_count
+        self._key_func: Callable[[Event], str] = key_func
+
+        self._queues = [self._create_queue() for _ in range(worker_count)]
+        self._queue = self._queues[0]
+
+        self._workers: list[Thread] = [
+            Thread(target=self._run, args=(queue,)) for queue in self._queues
+        ]
+
+    def start(self) -> None:
+        """
+        Start all worker threads and timer thread.
+        """
+        self._active = True
+
+        for worker in self._workers:
+            worker.start()
+
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stop event engine.
+        """
+        self._active = False
+        self._timer_wakeup.set()
+        self._timer.join()
+
+        for worker in self._workers:
+            worker.join()
+
+    def put(self, event: Event, block: bool = True) -> None:
+        """
+        Put an event object into event queue of the worker
+        responsible for its routing key.
+        """
+        if self._profiler:
+            event.put_time = perf_counter_ns()
+
+        if event.trace and self._tracer:
+            self._tracer.stamp(event.trace, "enqueue")
+
+        key: str = self._key_func(event)
+        queue: EventQueue = self._queues[hash(key) % self._worker_count]
+        # Only bounded queue needs to check the thread putting event
+        force: bool = self._maxsize > 0 and get_ident() in self._consumers
+        queue.put(event, block, force=force)
@@ -0,0 +1,125 @@
+"""
+Latency tracer which follows an event from gateway to order sending.
+"""
+
+import json
+from pathlib import Path
+from threading import Lock, local
+from time import perf_counter_ns
+
+from .profiler import LatencyHistogram, get_bucket_limit
+
+
+class Trace:
+    """
+    Timestamps of one traced event, kept as a side channel of event
+    instead of fields of data object.
+    """
+
+    __slots__ = ("start_time", "last_time")
+
+    def __init__(self) -> None:
+        """"""
+        self.start_time: int = perf_counter_ns()
+        self.last_time: int = self.start_time
+
+
+class LatencyTracer:
+    """
+    Records monotonic timestamps at each stage of a traced event, and
+    keeps a latency histogram for every stage.
+
+    Latency of a stage is the time from previous stamp of the same trace,
+    for example "dequeue" is the time event spent waiting in queue.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.lock: Lock = Lock()
+
+        # Trace of the event being processed in current thread
+        self.local: local = local()
+
+    def start(self) -> Trace:
+        """
+        Start a new trace.
+        """
+        return Trace()
+
+    def stamp(self, trace: Trace, stage: str) -> None:
+        """
+        Record latency of stage since previous stamp.
+        """
+        now: int = perf_counter_ns()
+        self.record(stage, now - trace.last_time)
+        trace.last_time = now
+
+    def finish(self, trace: Trace, stage: str, total_stage: str) -> None:
+        """
+        Record latency of last stage, and total latency since start.
+        """
+        self.stamp(trace, stage)
+        self.record(total_stage, trace.last_time - trace.start_time)
+
+    def record(self, stage: str, value: int) -> None:
+        """"""
+        with self.lock:
+            histogram: LatencyHistogram | None = self.histograms.get(stage, None)
+
+            if not histogram:
+                histogram = LatencyHistogram()
+                self.histograms[stage] = histogram
+
+            histogram.record(value)
+
+    def set_current(self, trace: Trace | None) -> None:
+        """
+        Set trace of the event being processed in current thread.
+        """
+        self.local.trace = trace
+
+    def get_current(self) -> Trace | None:
+        """
+        Get trace of the event being processed in current thread.
+        """
+        return getattr(self.local, "trace", None)
+
+    def get_snapshot(self) -> dict[str, dict]:
+        """
+        Get latency summary of every stage.
+        """
+        with self.lock:
+            return {
+                stage: histogram.get_summary()
+                for stage, histogram in self.histograms.items()
+            }
+
+    def export(self, path: Path | str) -> None:
+        """
+        Export summary and histogram buckets (upper limit in nanoseconds
+        and count) of every stage into a json file for offline analysis.
+        """
+        data: dict[str, dict] = {}
+
+        with self.lock:
+            for stage, histogram in self.histograms.items():
+                buckets: list[tuple[int, int]] = [
+                    (get_bucket_limit(bucket), n)
+                    for bucket, n in enumerate(histogram.buckets) if n
+                ]
+
+                data[stage] = {
+                    "summary": histogram.get_summary(),
+                    "buckets": buckets,
+                }
+
+        with open(path, mode="w", encoding="UTF-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    def reset(self) -> None:
+        """
+        Clear all recorded data.
+        """
+        with self.lock:
+            self.histograms = {}
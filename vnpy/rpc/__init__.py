@@ -1,8 +1,13 @@
 from .client import RpcClient
 from .server import RpcServer
+from .codec import BaseCodec, PickleCodec, MsgpackCodec, get_codec
 
 
 __all__ = [
     "RpcClient",
     "RpcServer",
+    "BaseCodec",
+    "PickleCodec",
+    "MsgpackCodec",
+    "get_codec",
 ]
@@ -1,11 +1,22 @@
+import asyncio
+import heapq
 import threading
-from time import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from itertools import count
+from time import time, sleep
 from functools import lru_cache
 from typing import Any
 
 import zmq
 
+from .codec import BaseCodec, PickleCodec
 from .common import HEARTBEAT_TOPIC, HEARTBEAT_TOLERANCE
+from .shm import ShmSubscriber, is_shm_address
+
+
+# Number of empty reads busy polling before sleeping in shm mode
+SHM_SPIN_COUNT: int = 10000
+SHM_IDLE_SLEEP: float = 0.0001
 
 
 class RemoteException(Exception):
@@ -29,29 +40,59 @@ class RemoteException(Exception):
 class RpcClient:
     """"""
 
-    def __init__(self) -> None:
-        """Constructor"""
+    def __init__(self, codec: BaseCodec | None = None) -> None:
+        """
+        Constructor, pickle codec is used if codec not specified.
+        """
+        # Codec for serializing messages, must be the same as server
+        self._codec: BaseCodec = codec or PickleCodec()
+
         # zmq port related
         self._context: zmq.Context = zmq.Context()
 
-        # Request socket (Request–reply pattern)
-        self._socket_req: zmq.Socket = self._context.socket(zmq.REQ)
+        # Dealer socket (Request–reply pattern with request id), which
+        # allows many requests in flight and is only used by request thread
+        self._socket_dealer: zmq.Socket = self._context.socket(zmq.DEALER)
 
         # Subscribe socket (Publish–subscribe pattern)
         self._socket_sub: zmq.Socket = self._context.socket(zmq.SUB)
 
         # Set socket option to keepalive
-        for socket in [self._socket_req, self._socket_sub]:
+        for socket in [self._socket_dealer, self._socket_sub]:
             socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
             socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 60)
 
+        # Heartbeat is always received no matter which topics subscribed
+        self._socket_sub.setsockopt_string(zmq.SUBSCRIBE, HEARTBEAT_TOPIC)
+        self._topics: tuple[bytes, ...] = (HEARTBEAT_TOPIC.encode(),)
+
+        # Shared memory ring buffer, used instead of subscribe socket
+        # if subscribe address is shm://name
+        self._shm: ShmSubscriber | None = None
+
+        # Requests from caller threads are passed to request thread
+        # through inproc PUSH/PULL sockets
+        request_address: str = f"inproc://rpc_request_{id(self)}"
+
+        self._socket_pull: zmq.Socket = self._context.socket(zmq.PULL)
+        self._socket_pull.bind(request_address)
+
+        self._socket_push: zmq.Socket = self._context.socket(zmq.PUSH)
+        self._socket_push.connect(request_address)
+
         # Worker thread relate, used to process data pushed from server
         self._active: bool = False                 # RpcClient status
         self._thread: threading.Thread | None = None      # RpcClient thread
+        self._request_thread: threading.Thread | None = None
         self._lock: threading.Lock = threading.Lock()
 
         self._last_received_ping: float = time()
 
+        # Requests in flight: futures by request id, and deadlines in heap
+        self._request_count: count = count(1)
+        self._futures: dict[bytes, Future] = {}
+        self._deadlines: list[tuple[float, bytes]] = []
+
     @lru_cache(100)  # noqa
     def __getattr__(self, name: str) -> Any:
         """
@@ -62,28 +103,50 @@ class RpcClient:
             # Get timeout value from kwargs, default value is 30 seconds
             timeout: int = kwargs.pop("timeout", 30000)
 
-            # Generate request
-            req: list = [name, args, kwargs]
-
             # Send request and wait for response
-            with self._lock:
-                self._socket_req.send_pyobj(req)
+            future: Future = self.call_async(name, *args, timeout=timeout, **kwargs)
 
-                # Timeout reached without any data
-                n: int = self._socket_req.poll(timeout)
-                if not n:
-                    msg: str = f"Timeout of {timeout}ms reached for {req}"
-                    raise RemoteException(msg)
+            try:
+                return future.result(timeout / 1000)
+            except FutureTimeoutError:
+                msg: str = f"Timeout of {timeout}ms reached for {[name, args, kwargs]}"
+                raise RemoteException(msg) from None
 
-                rep = self._socket_req.recv_pyobj()
+        return dorpc
 
-            # Return response if successed; Trigger exception if failed
-            if rep[0]:
-                return rep[1]
-            else:
-                raise RemoteException(rep[1])
+    def call_async(self, name: str, *args: Any, timeout: int = 30000, **kwargs: Any) -> Future:
+        """
+        Send request of remote function without waiting for response,
+        and return a future of the result.
 
-        return dorpc
+        Future raises RemoteException if remote function failed, or no
+        response received in timeout milliseconds. Requests in flight are
+        processed concurrently only if server runs with worker pool.
+        """
+        request_id: bytes = str(next(self._request_count)).encode()
+        deadline: float = time() + timeout / 1000
+
+        future: Future = Future()
+        if not self._active:
+            future.set_exception(RemoteException("RpcClient is not started"))
+            return future
+
+        self._futures[request_id] = future
+
+        req: list = [name, args, kwargs]
+        data: bytes = self._codec.encode(req)
+
+        with self._lock:
+            self._socket_push.send_multipart([request_id, str(deadline).encode(), data])
+
+        return future
+
+    async def acall(self, name: str, *args: Any, timeout: int = 30000, **kwargs: Any) -> Any:
+        """
+        Awaitable version of remote call, used in asyncio event loop.
+        """
+        future: Future = self.call_async(name, *args, timeout=timeout, **kwargs)
+        return await asyncio.wrap_future(future)
 
     def start(
         self,
@@ -97,16 +160,27 @@ class RpcClient:
             return
 
         # Connect zmq port
-        self._socket_req.connect(req_address)
-        self._socket_sub.connect(sub_address)
+        self._socket_dealer.connect(req_address)
+
+        if is_shm_address(sub_address):
+            self._shm = ShmSubscriber(sub_address)
+        else:
+            self._socket_sub.connect(sub_address)
 
         # Start RpcClient status
         self._active = True
 
-        # Start RpcClient thread
-        self._thread = threading.Thread(target=self.run)
+        # Start RpcClient thread for subscribed data, and request thread
+        # for remote calls, so that callbacks never block requests
+        if self._shm:
+            self._thread = threading.Thread(target=self.run_shm, args=(self._shm,))
+        else:
+            self._thread = threading.Thread(target=self.run)
         self._thread.start()
 
+        self._request_thread = threading.Thread(target=self.run_request)
+        self._request_thread.start()
+
         self._last_received_ping = time()
 
     def stop(self) -> None:
@@ -125,6 +199,10 @@ class RpcClient:
             self._thread.join()
         self._thread = None
 
+        if self._request_thread and self._request_thread.is_alive():
+            self._request_thread.join()
+        self._request_thread = None
+
     def run(self) -> None:
         """
         Run RpcClient function
@@ -137,18 +215,168 @@ class RpcClient:
                 continue
 
             # Receive data from subscribe socket
-            topic, data = self._socket_sub.recv_pyobj(flags=zmq.NOBLOCK)
+            self.process_sub()
 
-            if topic == HEARTBEAT_TOPIC:
-                self._last_received_ping = data
-            else:
-                # Process data by callable function
-                self.callback(topic, data)
+        # Close socket
+        self._socket_sub.close()
+
+    def run_request(self) -> None:
+        """
+        Send requests and receive responses in request thread, poll
+        timeout is limited by the nearest deadline of requests.
+        """
+        poller: zmq.Poller = zmq.Poller()
+        poller.register(self._socket_dealer, zmq.POLLIN)
+        poller.register(self._socket_pull, zmq.POLLIN)
+
+        while self._active:
+            timeout: int = 1000
+            if self._deadlines:
+                timeout = max(0, min(timeout, int((self._deadlines[0][0] - time()) * 1000) + 1))
+
+            events: dict = dict(poller.poll(timeout))
+
+            # Send requests from caller threads
+            if self._socket_pull in events:
+                self.send_requests()
+
+            # Receive responses of requests
+            if self._socket_dealer in events:
+                self.process_responses()
+
+            self.check_timeout(time())
+
+        # Fail requests left
+        while self._futures:
+            _, future = self._futures.popitem()
+            future.set_exception(RemoteException("RpcClient is stopped"))
 
         # Close socket
-        self._socket_req.close()
+        self._socket_dealer.close()
+        self._socket_pull.close()
+
+        with self._lock:
+            self._socket_push.close()
+
+    def run_shm(self, shm: ShmSubscriber) -> None:
+        """
+        Read data from shared memory ring buffer in shm mode.
+        """
+        last_received: float = time()
+        lost_count: int = 0
+        idle_count: int = 0
+
+        while self._active:
+            if not shm.is_attached() and not shm.attach():
+                sleep(0.1)
+            else:
+                records: list[tuple[bytes, bytes]] = shm.read(self._topics)
+
+                if shm.lost_count != lost_count:
+                    self.on_data_lost(shm.lost_count - lost_count)
+                    lost_count = shm.lost_count
+
+                if records:
+                    last_received = time()
+                    idle_count = 0
+
+                    for topic, data in records:
+                        self.process_data(topic.decode(), data)
+                    continue
+
+                # Busy polling for a while, then sleep if still idle
+                idle_count += 1
+                if idle_count < SHM_SPIN_COUNT:
+                    continue
+                sleep(SHM_IDLE_SLEEP)
+
+            # Attach again later, in case server restarted with new memory
+            now: float = time()
+            if now - last_received >= HEARTBEAT_TOLERANCE:
+                last_received = now
+                shm.close()
+                lost_count = shm.lost_count = 0
+                self.on_disconnected()
+
+        shm.close()
         self._socket_sub.close()
 
+    def process_sub(self) -> None:
+        """
+        Process all data received by subscribe socket, each message is
+        [topic, data, ...] with one or more data frames.
+        """
+        while True:
+            try:
+                frames: list[bytes] = self._socket_sub.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+            topic: str = frames[0].decode()
+
+            for data_frame in frames[1:]:
+                self.process_data(topic, data_frame)
+
+    def process_data(self, topic: str, data_frame: bytes) -> None:
+        """
+        Decode data received and process it.
+        """
+        data: Any = self._codec.decode(data_frame)
+
+        if topic == HEARTBEAT_TOPIC:
+            self._last_received_ping = data
+        else:
+            # Process data by callable function
+            self.callback(topic, data)
+
+    def send_requests(self) -> None:
+        """
+        Send requests as [request id, delimiter, data] by dealer socket,
+        which is supported by both REP and ROUTER mode of server.
+        """
+        while True:
+            try:
+                request_id, deadline, data = self._socket_pull.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+            heapq.heappush(self._deadlines, (float(deadline), request_id))
+            self._socket_dealer.send_multipart([request_id, b"", data])
+
+    def process_responses(self) -> None:
+        """
+        Set results of futures with responses received.
+        """
+        while True:
+            try:
+                frames: list[bytes] = self._socket_dealer.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+            future: Future | None = self._futures.pop(frames[0], None)
+            if not future:
+                continue
+
+            rep = self._codec.decode(frames[-1])
+
+            # Set result if successed; Set exception if failed
+            if rep[0]:
+                future.set_result(rep[1])
+            else:
+                future.set_exception(RemoteException(rep[1]))
+
+    def check_timeout(self, now: float) -> None:
+        """
+        Fail requests without response before deadline.
+        """
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, request_id = heapq.heappop(self._deadlines)
+
+            future: Future | None = self._futures.pop(request_id, None)
+            if future:
+                msg: str = f"Timeout reached for request {request_id.decode()}"
+                future.set_exception(RemoteException(msg))
+
     def callback(self, topic: str, data: Any) -> None:
         """
         Callable function
@@ -157,9 +385,17 @@ class RpcClient:
 
     def subscribe_topic(self, topic: str) -> None:
         """
-        Subscribe data
+        Subscribe data of topics starting with topic, empty for all topics.
         """
         self._socket_sub.setsockopt_string(zmq.SUBSCRIBE, topic)
+        self._topics = self._topics + (topic.encode(),)
+
+    def on_data_lost(self, count: int) -> None:
+        """
+        Callback when data in shared memory is overwritten before being read.
+        """
+        msg: str = f"{count} messages lost in shared memory, please check whether callback is too slow."
+        print(msg)
 
     def on_disconnected(self) -> None:
         """
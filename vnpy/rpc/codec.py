@@ -0,0 +1,317 @@
+"""
+Codecs used by RpcServer and RpcClient to serialize messages.
+"""
+
+import pickle
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from importlib import import_module
+from operator import attrgetter
+from threading import local
+from types import ModuleType
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from vnpy.trader.constant import (
+    Direction,
+    Offset,
+    Status,
+    Product,
+    OrderType,
+    OptionType,
+    Exchange,
+    Currency,
+    Interval
+)
+from vnpy.trader.object import (
+    TickData,
+    BarData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    LogData,
+    ContractData,
+    QuoteData,
+    SubscribeRequest,
+    OrderRequest,
+    CancelRequest,
+    HistoryRequest,
+    QuoteRequest,
+    SlotTickData,
+    SlotBarData
+)
+
+
+class BaseCodec(ABC):
+    """
+    Abstract codec class for encoding objects into bytes and back.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """
+        Encode object into bytes.
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode bytes into object.
+        """
+        pass
+
+
+class PickleCodec(BaseCodec):
+    """
+    Codec using pickle, which supports any python object and is wire
+    compatible with send_pyobj/recv_pyobj of zmq.
+    """
+
+    name: str = "pickle"
+
+    def encode(self, obj: Any) -> bytes:
+        """"""
+        return pickle.dumps(obj, pickle.DEFAULT_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        """"""
+        return pickle.loads(data)
+
+
+# Msgpack extension type codes
+EXT_PICKLE: int = 0
+EXT_DATACLASS: int = 1
+EXT_ENUM: int = 2
+EXT_DATETIME: int = 3
+
+# Classes are encoded by index in these tuples, only append new ones
+# to the end to keep compatible with existing peers.
+DATACLASSES: tuple[type, ...] = (
+    TickData,
+    BarData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    LogData,
+    ContractData,
+    QuoteData,
+    SubscribeRequest,
+    OrderRequest,
+    CancelRequest,
+    HistoryRequest,
+    QuoteRequest,
+    SlotTickData,
+    SlotBarData,
+)
+
+ENUMS: tuple[type[Enum], ...] = (
+    Direction,
+    Offset,
+    Status,
+    Product,
+    OrderType,
+    OptionType,
+    Exchange,
+    Currency,
+    Interval,
+)
+
+# Attributes set in __post_init__ which can not be derived again
+EXTRA_ATTRIBUTES: dict[type, tuple[str, ...]] = {
+    LogData: ("time",),
+}
+
+EPOCH: datetime = datetime(1970, 1, 1)
+
+
+class MsgpackCodec(BaseCodec):
+    """
+    Codec using msgpack with compact schema of trader objects.
+
+    Dataclasses of vnpy.trader.object are encoded as class index and
+    list of field values without names, enums as class index and value,
+    datetimes as wall clock microseconds and timezone. Extension payloads
+    of enums and datetimes are packed with struct and cached, to avoid
+    nested msgpack calls. Other objects not supported
+    by msgpack fall back to pickle, unless allow_pickle is False for
+    peers across trust boundary.
+
+    Package msgpack is required to use this codec.
+    """
+
+    name: str = "msgpack"
+
+    def __init__(self, allow_pickle: bool = True) -> None:
+        """"""
+        self.allow_pickle: bool = allow_pickle
+        self.msgpack: ModuleType = import_module("msgpack")
+
+        self.dataclass_codes: dict[type, int] = {cls: i for i, cls in enumerate(DATACLASSES)}
+        self.enum_codes: dict[type, int] = {cls: i for i, cls in enumerate(ENUMS)}
+
+        # Field names of each dataclass, and the number of init fields
+        self.schemas: list[tuple[tuple[str, ...], int]] = []
+        self.getters: list[attrgetter] = []
+
+        for cls in DATACLASSES:
+            init_names: list[str] = [f.name for f in fields(cls) if f.init]
+            other_names: list[str] = [f.name for f in fields(cls) if not f.init]
+            other_names.extend(EXTRA_ATTRIBUTES.get(cls, ()))
+
+            names: tuple[str, ...] = tuple(init_names + other_names)
+            self.schemas.append((names, len(init_names)))
+            self.getters.append(attrgetter(*names))
+
+        # Packers are reused in each thread, one for each nested level
+        self.local: local = local()
+
+        # Cache of enum members packed and unpacked
+        self.enum_exts: dict[Enum, Any] = {}
+        self.enum_members: dict[bytes, Enum] = {}
+
+        self.tzinfos: dict[str, Any] = {}
+
+    def encode(self, obj: Any) -> bytes:
+        """"""
+        packers: list = self.local.__dict__.setdefault("packers", [])
+        depth: int = self.local.__dict__.get("depth", 0)
+
+        if depth == len(packers):
+            packers.append(self.msgpack.Packer(default=self.pack_default, use_bin_type=True))
+        packer: Any = packers[depth]
+
+        self.local.depth = depth + 1
+        try:
+            data: bytes = packer.pack(obj)
+        except Exception:
+            packer.reset()
+            raise
+        finally:
+            self.local.depth = depth
+
+        return data
+
+    def decode(self, data: bytes) -> Any:
+        """"""
+        return self.msgpack.unpackb(
+            data,
+            ext_hook=self.unpack_ext,
+            raw=False,
+            strict_map_key=False
+        )
+
+    def pack_default(self, obj: Any) -> Any:
+        """
+        Pack objects not supported by msgpack.
+        """
+        ExtType: type = self.msgpack.ExtType
+
+        code: int | None = self.dataclass_codes.get(type(obj), None)
+        if code is not None:
+            values: tuple = (code, *self.getters[code](obj))
+            return ExtType(EXT_DATACLASS, self.encode(values))
+
+        code = self.enum_codes.get(type(obj), None)
+        if code is not None:
+            ext: Any = self.enum_exts.get(obj, None)
+            if ext is None:
+                ext = ExtType(EXT_ENUM, self.encode([code, obj.value]))
+                self.enum_exts[obj] = ext
+            return ext
+
+        if isinstance(obj, datetime):
+            return ExtType(EXT_DATETIME, self.pack_datetime(obj))
+
+        if not self.allow_pickle:
+            raise TypeError(f"Object of type {type(obj).__name__} is not supported by msgpack codec")
+
+        return ExtType(EXT_PICKLE, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+    def unpack_ext(self, code: int, data: bytes) -> Any:
+        """
+        Unpack extension types.
+        """
+        if code == EXT_DATACLASS:
+            values: list = self.decode(data)
+            cls: type = DATACLASSES[values[0]]
+            names, init_count = self.schemas[values[0]]
+
+            obj: Any = cls(*values[1:init_count + 1])
+            # Attributes missing from peer with older schema are left as default
+            for name, value in zip(names[init_count:], values[init_count + 1:], strict=False):
+                setattr(obj, name, value)
+            return obj
+        elif code == EXT_ENUM:
+            member: Enum | None = self.enum_members.get(data, None)
+            if member is None:
+                enum_code, value = self.decode(data)
+                member = ENUMS[enum_code](value)
+                self.enum_members[data] = member
+            return member
+        elif code == EXT_DATETIME:
+            return self.unpack_datetime(data)
+        elif code == EXT_PICKLE:
+            if not self.allow_pickle:
+                raise ValueError("Pickled object is not allowed by msgpack codec")
+            return pickle.loads(data)
+
+        return self.msgpack.ExtType(code, data)
+
+    def pack_datetime(self, dt: datetime) -> bytes:
+        """
+        Pack datetime into 8 bytes of wall clock microseconds followed by
+        timezone name, which is ZoneInfo key, "=" and offset seconds for
+        fixed offset, or empty if naive.
+        """
+        micros: int = (dt.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1)
+
+        tz: Any = dt.tzinfo
+        if tz is None:
+            name: str = ""
+        elif isinstance(tz, ZoneInfo):
+            name = tz.key
+        else:
+            offset: timedelta | None = dt.utcoffset()
+            name = "=" + str(offset.total_seconds() if offset else 0)
+
+        return struct.pack("<q", micros) + name.encode()
+
+    def unpack_datetime(self, data: bytes) -> datetime:
+        """"""
+        micros: int = struct.unpack_from("<q", data)[0]
+        dt: datetime = EPOCH + timedelta(microseconds=micros)
+
+        name: str = data[8:].decode()
+        if not name:
+            return dt
+
+        tz: Any = self.tzinfos.get(name, None)
+        if not tz:
+            if name.startswith("="):
+                tz = timezone(timedelta(seconds=float(name[1:])))
+            else:
+                tz = ZoneInfo(name)
+            self.tzinfos[name] = tz
+
+        return dt.replace(tzinfo=tz)
+
+
+CODECS: dict[str, type[BaseCodec]] = {
+    PickleCodec.name: PickleCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def get_codec(name: str = "pickle") -> BaseCodec:
+    """
+    Create codec by name.
+    """
+    return CODECS[name]()
@@ -1,37 +1,85 @@
 import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from time import time
 from collections.abc import Callable
 
 import zmq
 
+from .codec import BaseCodec, PickleCodec
 from .common import HEARTBEAT_TOPIC, HEARTBEAT_INTERVAL
+from .shm import ShmPublisher, is_shm_address
 
 
 class RpcServer:
     """"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        codec: BaseCodec | None = None,
+        worker_count: int = 0,
+        batch_size: int = 0,
+        batch_interval: int = 1000
+    ) -> None:
         """
-        Constructor
+        Constructor, pickle codec is used if codec not specified.
+
+        Requests are processed one by one in server thread by default.
+        If worker_count is larger than 0, ROUTER socket is used instead
+        of REP, and requests are processed concurrently by worker pool,
+        except functions registered as fast path which run inline.
+
+        If batch_size is larger than 1, published data is buffered and
+        flushed every batch_size messages or batch_interval microseconds.
         """
+        # Codec for serializing messages
+        self._codec: BaseCodec = codec or PickleCodec()
+
         # Save functions dict: key is function name, value is function object
         self._functions: dict[str, Callable] = {}
+        self._fast_functions: set[str] = set()
 
         # Zmq port related
         self._context: zmq.Context = zmq.Context()
 
-        # Reply socket (Request–reply pattern)
-        self._socket_rep: zmq.Socket = self._context.socket(zmq.REP)
+        # Reply socket (Request–reply pattern), ROUTER socket if using worker pool
+        self._worker_count: int = worker_count
+        if worker_count:
+            self._socket_rep: zmq.Socket = self._context.socket(zmq.ROUTER)
+        else:
+            self._socket_rep = self._context.socket(zmq.REP)
 
         # Publish socket (Publish–subscribe pattern)
         self._socket_pub: zmq.Socket = self._context.socket(zmq.PUB)
 
+        # Shared memory ring buffer, used instead of publish socket
+        # if publish address is shm://name
+        self._shm: ShmPublisher | None = None
+
         # Worker thread related
         self._active: bool = False                          # RpcServer status
         self._thread: threading.Thread | None = None        # RpcServer thread
         self._lock: threading.Lock = threading.Lock()
 
+        # Worker pool related, results are sent back to server thread
+        # by PUSH socket of each worker through inproc address
+        self._result_address: str = f"inproc://rpc_result_{id(self)}"
+        self._result_local: threading.local = threading.local()
+        self._result_sockets: list[zmq.Socket] = []
+
+        # Publish batch related, data frames are grouped by topic
+        self._batch_size: int = batch_size
+        self._batch_interval: float = batch_interval / 1_000_000
+        self._batches: dict[bytes, list[bytes]] = {}
+        self._batch_count: int = 0
+        self._batch_time: float = 0
+
+        # Poll timeout of server thread in milliseconds
+        if batch_size > 1:
+            self._poll_timeout: int = max(1, batch_interval // 1000)
+        else:
+            self._poll_timeout = 1000
+
         # Heartbeat related
         self._heartbeat_at: float | None = None
 
@@ -52,13 +100,20 @@ class RpcServer:
 
         # Bind socket address
         self._socket_rep.bind(rep_address)
-        self._socket_pub.bind(pub_address)
+
+        if is_shm_address(pub_address):
+            self._shm = ShmPublisher(pub_address)
+        else:
+            self._socket_pub.bind(pub_address)
 
         # Start RpcServer status
         self._active = True
 
         # Start RpcServer thread
-        self._thread = threading.Thread(target=self.run)
+        if self._worker_count:
+            self._thread = threading.Thread(target=self.run_router)
+        else:
+            self._thread = threading.Thread(target=self.run)
         self._thread.start()
 
         # Init heartbeat publish timestamp
@@ -86,46 +141,217 @@ class RpcServer:
         """
         while self._active:
             # Poll response socket for 1 second
-            n: int = self._socket_rep.poll(1000)
+            n: int = self._socket_rep.poll(self._poll_timeout)
             self.check_heartbeat()
+            self.check_batches()
 
             if not n:
                 continue
 
             # Receive request data from Reply socket
-            req = self._socket_rep.recv_pyobj()
+            req = self._codec.decode(self._socket_rep.recv())
 
-            # Get function name and parameters
-            name, args, kwargs = req
+            # Execute function and send response by Reply socket
+            self._socket_rep.send(self.execute(req))
 
-            # Try to get and execute callable function object; capture exception information if it fails
-            try:
-                func: Callable = self._functions[name]
-                r: object = func(*args, **kwargs)
-                rep: list = [True, r]
-            except Exception as e:  # noqa
-                rep = [False, traceback.format_exc()]
+        # Send data left in batches
+        self.flush()
+
+        # Unbind socket address
+        self._socket_pub.close()
+        self._socket_rep.close()
+
+        if self._shm:
+            self._shm.close()
+            self._shm = None
+
+    def run_router(self) -> None:
+        """
+        Run RpcServer functions with worker pool.
 
-            # send callable response by Reply socket
-            self._socket_rep.send_pyobj(rep)
+        Request received by ROUTER socket is [identity, ..., data], the
+        frames before data (identity, delimiter and request id sent by
+        client) are kept as envelope and sent back with response data.
+        """
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(self._worker_count)
+
+        socket_result: zmq.Socket = self._context.socket(zmq.PULL)
+        socket_result.bind(self._result_address)
+
+        poller: zmq.Poller = zmq.Poller()
+        poller.register(self._socket_rep, zmq.POLLIN)
+        poller.register(socket_result, zmq.POLLIN)
+
+        while self._active:
+            events: dict = dict(poller.poll(self._poll_timeout))
+            self.check_heartbeat()
+            self.check_batches()
+
+            # Process all requests received
+            if self._socket_rep in events:
+                while True:
+                    try:
+                        frames: list[bytes] = self._socket_rep.recv_multipart(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+
+                    envelope: list[bytes] = frames[:-1]
+                    req = self._codec.decode(frames[-1])
+
+                    if req[0] in self._fast_functions:
+                        self._socket_rep.send_multipart(envelope + [self.execute(req)])
+                    else:
+                        executor.submit(self.process_request, envelope, req)
+
+            # Send all results finished by workers
+            if socket_result in events:
+                self.send_results(socket_result)
+
+        # Wait for workers to finish, and send results left
+        executor.shutdown(wait=True)
+        self.send_results(socket_result)
+
+        for socket in self._result_sockets:
+            socket.close()
+        socket_result.close()
+
+        # Send data left in batches
+        self.flush()
 
         # Unbind socket address
         self._socket_pub.close()
         self._socket_rep.close()
 
+        if self._shm:
+            self._shm.close()
+            self._shm = None
+
+    def process_request(self, envelope: list[bytes], req: list) -> None:
+        """
+        Execute request in worker thread, and send result back to server thread.
+        """
+        socket: zmq.Socket | None = getattr(self._result_local, "socket", None)
+
+        if not socket:
+            socket = self._context.socket(zmq.PUSH)
+            socket.connect(self._result_address)
+
+            self._result_local.socket = socket
+            with self._lock:
+                self._result_sockets.append(socket)
+
+        socket.send_multipart(envelope + [self.execute(req)])
+
+    def send_results(self, socket_result: zmq.Socket) -> None:
+        """
+        Send results received from workers by ROUTER socket.
+        """
+        while True:
+            try:
+                frames: list[bytes] = socket_result.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+            self._socket_rep.send_multipart(frames)
+
+    def execute(self, req: list) -> bytes:
+        """
+        Execute function of request and return encoded response.
+        """
+        # Get function name and parameters
+        name, args, kwargs = req
+
+        # Try to get and execute callable function object; capture exception information if it fails
+        try:
+            func: Callable = self._functions[name]
+            r: object = func(*args, **kwargs)
+            rep: list = [True, r]
+        except Exception as e:  # noqa
+            rep = [False, traceback.format_exc()]
+
+        return self._codec.encode(rep)
+
     def publish(self, topic: str, data: object) -> None:
         """
-        Publish data
+        Publish data as [topic, data] multipart message, so that topic
+        subscribed by client is filtered by zmq before sending.
+
+        In batch mode, data of the same topic are sent together as
+        [topic, data, data, ...] when batch is flushed.
+
+        In shm mode, data is written into shared memory immediately, and
+        data too large for the ring buffer is dropped without raising.
         """
+        topic_frame: bytes = topic.encode()
+        data_frame: bytes = self._codec.encode(data)
+
         with self._lock:
-            self._socket_pub.send_pyobj([topic, data])
+            if self._shm:
+                self._shm.write(topic_frame, data_frame)
+                return
+
+            if self._batch_size <= 1:
+                self._socket_pub.send_multipart([topic_frame, data_frame])
+                return
+
+            now: float = time()
+            if not self._batch_count:
+                self._batch_time = now
+
+            frames: list[bytes] | None = self._batches.get(topic_frame, None)
+            if frames:
+                frames.append(data_frame)
+            else:
+                self._batches[topic_frame] = [topic_frame, data_frame]
 
-    def register(self, func: Callable) -> None:
+            self._batch_count += 1
+
+            if (
+                self._batch_count >= self._batch_size
+                or now - self._batch_time >= self._batch_interval
+            ):
+                self.send_batches()
+
+    def flush(self) -> None:
+        """
+        Send all data buffered in batches.
         """
-        Register function
+        with self._lock:
+            self.send_batches()
+
+    def check_batches(self) -> None:
+        """
+        Flush batches waiting longer than batch interval.
+        """
+        if not self._batch_count:
+            return
+
+        with self._lock:
+            if self._batch_count and time() - self._batch_time >= self._batch_interval:
+                self.send_batches()
+
+    def send_batches(self) -> None:
+        """
+        Send batches by publish socket, must be called with lock acquired.
+        """
+        for frames in self._batches.values():
+            self._socket_pub.send_multipart(frames)
+
+        self._batches.clear()
+        self._batch_count = 0
+
+    def register(self, func: Callable, fast: bool = False) -> None:
+        """
+        Register function. Fast path function (such as send_order) runs
+        inline in server thread without being queued into worker pool.
         """
         self._functions[func.__name__] = func
 
+        if fast:
+            self._fast_functions.add(func.__name__)
+        else:
+            self._fast_functions.discard(func.__name__)
+
     def check_heartbeat(self) -> None:
         """
         Check whether it is required to send heartbeat.
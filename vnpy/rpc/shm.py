@@ -0,0 +1,314 @@
+"""
+Shared memory ring buffer used as publish transport between processes
+on the same host.
+"""
+
+import struct
+import sys
+from math import ceil
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import cast
+from urllib.parse import SplitResult, urlsplit, parse_qsl
+
+
+SHM_SCHEME: str = "shm://"
+
+# Default layout, can be changed by address like shm://name?slot_count=65536&slot_size=1024
+SHM_SLOT_COUNT: int = 65536
+SHM_SLOT_SIZE: int = 1024
+
+# Header is magic, slot count and slot size, and write sequence is kept
+# in its own cache line
+MAGIC: bytes = b"VNRB"
+HEADER: struct.Struct = struct.Struct("<4sII")
+SEQ: struct.Struct = struct.Struct("<Q")
+SEQ_OFFSET: int = 64
+SLOT_OFFSET: int = 128
+
+# Each slot is sequence, topic length, data length and number of slots
+# taken by the record (0 for continuation slots), followed by payload.
+# Payload of record is topic and data, split into continuous slots if
+# larger than one slot.
+SLOT_HEADER: struct.Struct = struct.Struct("<QHIH")
+SLOT_HEADER_SIZE: int = 16
+
+# Names of shared memory created by publishers in this process
+created_names: set[str] = set()
+
+
+def is_shm_address(address: str) -> bool:
+    """"""
+    return address.startswith(SHM_SCHEME)
+
+
+def parse_shm_address(address: str) -> tuple[str, dict[str, int]]:
+    """
+    Parse shm address into shared memory name and layout parameters.
+    """
+    result: SplitResult = urlsplit(address)
+    params: dict[str, int] = {k: int(v) for k, v in parse_qsl(result.query)}
+    return result.netloc, params
+
+
+class ShmPublisher:
+    """
+    Single producer of ring buffer with fixed size slots.
+
+    Slot sequence is set to 0 before writing and to message sequence
+    after writing, so that readers can detect slots being overwritten.
+    Records larger than half of the ring are dropped and counted in
+    dropped_count. Writing must be serialized by caller.
+    """
+
+    def __init__(self, address: str) -> None:
+        """"""
+        name, params = parse_shm_address(address)
+
+        self.slot_count: int = params.get("slot_count", SHM_SLOT_COUNT)
+        self.slot_size: int = params.get("slot_size", SHM_SLOT_SIZE)
+        self.payload_size: int = self.slot_size - SLOT_HEADER_SIZE
+        self.max_parts: int = max(1, self.slot_count // 2)
+
+        self.seq: int = 0
+        self.dropped_count: int = 0
+
+        size: int = SLOT_OFFSET + self.slot_count * self.slot_size
+
+        # Remove segment left by previous process with the same name
+        try:
+            self.shm: SharedMemory = SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            stale: SharedMemory = SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self.shm = SharedMemory(name, create=True, size=size)
+
+        created_names.add(name)
+
+        self.buf: memoryview = cast(memoryview, self.shm.buf)
+        SEQ.pack_into(self.buf, SEQ_OFFSET, 0)
+        HEADER.pack_into(self.buf, 0, MAGIC, self.slot_count, self.slot_size)
+
+    def write(self, topic: bytes, data: bytes) -> bool:
+        """
+        Write one message into next slots, return False if dropped.
+        """
+        topic_size: int = len(topic)
+        data_size: int = len(data)
+        size: int = topic_size + data_size
+
+        parts: int = max(1, ceil(size / self.payload_size))
+        if parts > self.max_parts or topic_size > 0xFFFF:
+            self.dropped_count += 1
+            return False
+
+        buf: memoryview = self.buf
+        seq: int = self.seq + 1
+
+        if parts == 1:
+            offset: int = SLOT_OFFSET + (seq - 1) % self.slot_count * self.slot_size
+            SEQ.pack_into(buf, offset, 0)
+
+            start: int = offset + SLOT_HEADER_SIZE
+            buf[start:start + topic_size] = topic
+            start += topic_size
+            buf[start:start + data_size] = data
+
+            SLOT_HEADER.pack_into(buf, offset, seq, topic_size, data_size, 1)
+        else:
+            payload: bytes = topic + data
+
+            for i in range(parts):
+                offset = SLOT_OFFSET + (seq + i - 1) % self.slot_count * self.slot_size
+                SEQ.pack_into(buf, offset, 0)
+
+                chunk: bytes = payload[i * self.payload_size:(i + 1) * self.payload_size]
+                start = offset + SLOT_HEADER_SIZE
+                buf[start:start + len(chunk)] = chunk
+
+                SLOT_HEADER.pack_into(buf, offset, seq + i, topic_size, data_size, parts if not i else 0)
+
+        # Readers only read slots up to write sequence
+        self.seq = seq + parts - 1
+        SEQ.pack_into(buf, SEQ_OFFSET, self.seq)
+
+        return True
+
+    def close(self) -> None:
+        """
+        Close and remove shared memory.
+        """
+        self.buf.release()
+        self.shm.close()
+        self.shm.unlink()
+
+        created_names.discard(self.shm.name)
+
+
+class ShmSubscriber:
+    """
+    One of consumers of ring buffer, which reads messages after the
+    latest one when attached.
+
+    Slots overwritten before being read are skipped and counted in
+    lost_count, reader then continues from the oldest record left.
+    """
+
+    def __init__(self, address: str) -> None:
+        """"""
+        self.name: str = parse_shm_address(address)[0]
+
+        self.shm: SharedMemory | None = None
+        self.buf: memoryview | None = None
+        self.slot_count: int = 0
+        self.slot_size: int = 0
+
+        self.seq: int = 0
+        self.lost_count: int = 0
+
+    def attach(self) -> bool:
+        """
+        Attach to shared memory created by publisher.
+        """
+        try:
+            shm: SharedMemory = SharedMemory(self.name)
+        except FileNotFoundError:
+            return False
+
+        # Shared memory is owned by publisher, and should not be removed
+        # by resource tracker (registered with leading slash on POSIX)
+        # when subscriber process exits
+        if sys.platform != "win32" and self.name not in created_names:
+            resource_tracker.unregister("/" + shm.name, "shared_memory")
+
+        buf: memoryview = cast(memoryview, shm.buf)
+
+        magic, slot_count, slot_size = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            return False
+
+        self.shm = shm
+        self.buf = buf
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+
+        return True
+
+    def is_attached(self) -> bool:
+        """"""
+        return self.shm is not None
+
+    def read(self, prefixes: tuple[bytes, ...]) -> list[tuple[bytes, bytes]]:
+        """
+        Read all new messages of topics starting with any of prefixes,
+        and return list of (topic, data).
+        """
+        buf: memoryview | None = self.buf
+        if buf is None:
+            return []
+
+        slot_count: int = self.slot_count
+        slot_size: int = self.slot_size
+        write_seq: int = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+
+        records: list[tuple[bytes, bytes]] = []
+
+        while self.seq < write_seq:
+            seq: int = self.seq + 1
+
+            # Skip messages already overwritten
+            oldest: int = write_seq - slot_count + 1
+            if seq < oldest:
+                self.lost_count += oldest - seq
+                self.seq = oldest - 1
+                continue
+
+            offset: int = SLOT_OFFSET + (seq - 1) % slot_count * slot_size
+            slot_seq, topic_size, data_size, parts = SLOT_HEADER.unpack_from(buf, offset)
+
+            # Skip continuation slots of record whose first slot is lost
+            if slot_seq == seq and not parts:
+                self.lost_count += 1
+                self.seq = seq
+                continue
+
+            if slot_seq == seq and parts == 1 and SLOT_HEADER_SIZE + topic_size + data_size <= slot_size:
+                start: int = offset + SLOT_HEADER_SIZE
+                topic: bytes = bytes(buf[start:start + topic_size])
+
+                data: bytes | None = None
+                if topic.startswith(prefixes):
+                    start += topic_size
+                    data = bytes(buf[start:start + data_size])
+
+                # Check slot again in case of being overwritten while copying
+                if SEQ.unpack_from(buf, offset)[0] == seq:
+                    self.seq = seq
+                    if data is not None:
+                        records.append((topic, data))
+                    continue
+            elif slot_seq == seq and 1 < parts <= write_seq - seq + 1:
+                record: tuple[bytes, bytes] | None = self.read_parts(seq, parts, topic_size, data_size)
+
+                if record:
+                    self.seq = seq + parts - 1
+                    if record[0].startswith(prefixes):
+                        records.append(record)
+                    continue
+
+            # Slot is being overwritten by publisher, read header again
+            self.lost_count += 1
+            self.seq = seq
+            write_seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+
+        return records
+
+    def read_parts(
+        self,
+        seq: int,
+        parts: int,
+        topic_size: int,
+        data_size: int
+    ) -> tuple[bytes, bytes] | None:
+        """
+        Read record taking several slots, return None if overwritten.
+        """
+        buf: memoryview = cast(memoryview, self.buf)
+        payload_size: int = self.slot_size - SLOT_HEADER_SIZE
+        size: int = topic_size + data_size
+
+        if ceil(size / payload_size) != parts:
+            return None
+
+        chunks: list[bytes] = []
+
+        for i in range(parts):
+            offset: int = SLOT_OFFSET + (seq + i - 1) % self.slot_count * self.slot_size
+            if SEQ.unpack_from(buf, offset)[0] != seq + i:
+                return None
+
+            start: int = offset + SLOT_HEADER_SIZE
+            chunks.append(bytes(buf[start:start + min(payload_size, size - i * payload_size)]))
+
+        # Slots are overwritten in order, so the first one is checked again
+        first_offset: int = SLOT_OFFSET + (seq - 1) % self.slot_count * self.slot_size
+        if SEQ.unpack_from(buf, first_offset)[0] != seq:
+            return None
+
+        payload: bytes = b"".join(chunks)
+        return payload[:topic_size], payload[topic_size:]
+
+    def close(self) -> None:
+        """
+        Detach from shared memory.
+        """
+        if self.buf is not None:
+            self.buf.release()
+            self.buf = None
+
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
@@ -14,6 +14,131 @@ if TYPE_CHECKING:
     from .engine import OmsEngine
 
 
+class FrozenCounter:
+    """
+    Aggregates frozen volume of active close orders in one direction,
+    so that frozen position can be calculated without iterating all
+    active orders.
+
+    Orders are kept in the sequence of becoming active, since frozen
+    volume of close orders is moved to yesterday position only when
+    exceeding today position at the time of a later close order.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.td_orders: dict[str, tuple[int, float]] = {}
+        self.yd_orders: dict[str, float] = {}
+        self.close_orders: dict[str, tuple[int, float]] = {}
+
+        self.td_frozen: float = 0
+        self.yd_frozen: float = 0
+        self.close_frozen: float = 0
+
+        # Sequence of the latest close order, and frozen volume of
+        # close today orders after it.
+        self.last_close_seq: int = 0
+        self.td_frozen_after: float = 0
+
+    def update(self, vt_orderid: str, offset: Offset, frozen: float, seq: int) -> None:
+        """
+        Add or update frozen volume of an active close order. The seq is
+        only used if the order is new.
+        """
+        if offset == Offset.CLOSETODAY:
+            old: tuple[int, float] | None = self.td_orders.get(vt_orderid, None)
+            if old:
+                seq = old[0]
+                self.td_frozen -= old[1]
+                if seq > self.last_close_seq:
+                    self.td_frozen_after -= old[1]
+
+            self.td_orders[vt_orderid] = (seq, frozen)
+            self.td_frozen += frozen
+            if seq > self.last_close_seq:
+                self.td_frozen_after += frozen
+        elif offset == Offset.CLOSEYESTERDAY:
+            self.yd_frozen += frozen - self.yd_orders.get(vt_orderid, 0)
+            self.yd_orders[vt_orderid] = frozen
+        elif offset == Offset.CLOSE:
+            old = self.close_orders.get(vt_orderid, None)
+            if old:
+                seq = old[0]
+                self.close_frozen -= old[1]
+
+            self.close_orders[vt_orderid] = (seq, frozen)
+            self.close_frozen += frozen
+
+            if seq > self.last_close_seq:
+                self.last_close_seq = seq
+                self.calculate_td_frozen_after()
+
+    def remove(self, vt_orderid: str, offset: Offset) -> None:
+        """
+        Remove an order which is no longer active.
+        """
+        if offset == Offset.CLOSETODAY:
+            old: tuple[int, float] | None = self.td_orders.pop(vt_orderid, None)
+            if not old:
+                return
+
+            self.td_frozen -= old[1]
+            if old[0] > self.last_close_seq:
+                self.td_frozen_after -= old[1]
+
+            if not self.td_orders:
+                self.td_frozen = 0
+                self.td_frozen_after = 0
+        elif offset == Offset.CLOSEYESTERDAY:
+            if vt_orderid not in self.yd_orders:
+                return
+
+            self.yd_frozen -= self.yd_orders.pop(vt_orderid)
+
+            if not self.yd_orders:
+                self.yd_frozen = 0
+        elif offset == Offset.CLOSE:
+            old = self.close_orders.pop(vt_orderid, None)
+            if not old:
+                return
+
+            self.close_frozen -= old[1]
+
+            if not self.close_orders:
+                self.close_frozen = 0
+                self.last_close_seq = 0
+                self.calculate_td_frozen_after()
+            elif old[0] == self.last_close_seq:
+                last_seq, _ = self.close_orders[next(reversed(self.close_orders))]
+                self.last_close_seq = last_seq
+                self.calculate_td_frozen_after()
+
+    def calculate_td_frozen_after(self) -> None:
+        """
+        Sum frozen volume of close today orders after the latest close
+        order, only those orders need to be iterated.
+        """
+        self.td_frozen_after = 0
+
+        for seq, frozen in reversed(self.td_orders.values()):
+            if seq <= self.last_close_seq:
+                break
+            self.td_frozen_after += frozen
+
+    def get_frozen(self, td_volume: float) -> tuple[float, float]:
+        """
+        Get today and yesterday frozen volume with today position volume.
+        """
+        if self.close_orders:
+            td_frozen_before: float = self.td_frozen - self.td_frozen_after + self.close_frozen
+            td_frozen: float = min(td_frozen_before, td_volume) + self.td_frozen_after
+        else:
+            td_frozen = self.td_frozen
+
+        yd_frozen: float = self.yd_frozen + self.td_frozen + self.close_frozen - td_frozen
+        return td_frozen, yd_frozen
+
+
 class PositionHolding:
     """"""
 
@@ -24,6 +149,13 @@ class PositionHolding:
 
         self.active_orders: dict[str, OrderData] = {}
 
+        # Frozen counters of long and short close orders
+        self.frozen_counters: dict[Direction, FrozenCounter] = {
+            Direction.LONG: FrozenCounter(),
+            Direction.SHORT: FrozenCounter()
+        }
+        self.order_seq: int = 0
+
         self.long_pos: float = 0
         self.long_yd: float = 0
         self.long_td: float = 0
@@ -54,13 +186,48 @@ class PositionHolding:
     def update_order(self, order: OrderData) -> None:
         """"""
         if order.is_active():
+            previous: OrderData | None = self.active_orders.get(order.vt_orderid, None)
             self.active_orders[order.vt_orderid] = order
+
+            # Rebuild counters in rare case of order direction or offset changed
+            if previous and (
+                previous.direction != order.direction
+                or previous.offset != order.offset
+            ):
+                self.rebuild_counters()
+            # Otherwise apply change of frozen volume of this order only
+            else:
+                self.update_counter(order)
         else:
             if order.vt_orderid in self.active_orders:
-                self.active_orders.pop(order.vt_orderid)
+                old_order: OrderData = self.active_orders.pop(order.vt_orderid)
+
+                if old_order.direction:
+                    counter: FrozenCounter = self.frozen_counters[old_order.direction]
+                    counter.remove(old_order.vt_orderid, old_order.offset)
 
         self.calculate_frozen()
 
+    def update_counter(self, order: OrderData) -> None:
+        """"""
+        if not order.direction or order.offset == Offset.OPEN:
+            return
+
+        counter: FrozenCounter = self.frozen_counters[order.direction]
+
+        self.order_seq += 1
+        counter.update(order.vt_orderid, order.offset, order.volume - order.traded, self.order_seq)
+
+    def rebuild_counters(self) -> None:
+        """"""
+        self.frozen_counters = {
+            Direction.LONG: FrozenCounter(),
+            Direction.SHORT: FrozenCounter()
+        }
+
+        for order in self.active_orders.values():
+            self.update_counter(order)
+
     def update_order_request(self, req: OrderRequest, vt_orderid: str) -> None:
         """"""
         gateway_name, orderid = vt_orderid.split(".")
@@ -110,7 +277,22 @@ class PositionHolding:
         self.sum_pos_frozen()
 
     def calculate_frozen(self) -> None:
-        """"""
+        """
+        Calculate frozen volume from aggregated close orders, which
+        gives the same result of calculate_frozen_full.
+        """
+        long_counter: FrozenCounter = self.frozen_counters[Direction.LONG]
+        self.short_td_frozen, self.short_yd_frozen = long_counter.get_frozen(self.short_td)
+
+        short_counter: FrozenCounter = self.frozen_counters[Direction.SHORT]
+        self.long_td_frozen, self.long_yd_frozen = short_counter.get_frozen(self.long_td)
+
+        self.sum_pos_frozen()
+
+    def calculate_frozen_full(self) -> None:
+        """
+        Calculate frozen volume by iterating all active orders.
+        """
         self.long_pos_frozen = 0
         self.long_yd_frozen = 0
         self.long_td_frozen = 0
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from importlib import import_module
 
 from .constant import Interval, Exchange
-from .object import BarData, TickData
+from .object import BarData, TickData, BarBatch, TickBatch
 from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
@@ -95,6 +95,55 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def save_bar_batch(self, batch: BarBatch, stream: bool = False) -> bool:
+        """
+        Save columnar bar batch into database.
+
+        Database driver can override it to write columns directly,
+        otherwise rows are materialized and saved by save_bar_data.
+        """
+        return self.save_bar_data(batch.to_bars(), stream)
+
+    def save_tick_batch(self, batch: TickBatch, stream: bool = False) -> bool:
+        """
+        Save columnar tick batch into database.
+
+        Database driver can override it to write columns directly,
+        otherwise rows are materialized and saved by save_tick_data.
+        """
+        return self.save_tick_data(batch.to_ticks(), stream)
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarBatch | None:
+        """
+        Load bar data from database as columnar batch.
+        """
+        bars: list[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
+        if not bars:
+            return None
+        return BarBatch.from_bars(bars)
+
+    def load_tick_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickBatch | None:
+        """
+        Load tick data from database as columnar batch.
+        """
+        ticks: list[TickData] = self.load_tick_data(symbol, exchange, start, end)
+        if not ticks:
+            return None
+        return TickBatch.from_ticks(ticks)
+
     @abstractmethod
     def delete_bar_data(
         self,
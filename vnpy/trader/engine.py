@@ -4,11 +4,17 @@ import traceback
 from abc import ABC, abstractmethod
 from email.message import EmailMessage
 from queue import Empty, Queue
-from threading import Thread
-from typing import TypeVar
-from collections.abc import Callable
-
-from vnpy.event import Event, EventEngine
+from threading import Thread, Lock
+from typing import Any, TypeVar
+from types import MappingProxyType
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from time import monotonic
+from datetime import date
+
+from vnpy.event import Event, EventEngine, LatencyTracer
+from vnpy.event.tracer import Trace
 from .app import BaseApp
 from .event import (
     EVENT_TICK,
@@ -17,6 +23,7 @@ from .event import (
     EVENT_POSITION,
     EVENT_ACCOUNT,
     EVENT_CONTRACT,
+    EVENT_CONTRACTS,
     EVENT_LOG,
     EVENT_QUOTE
 )
@@ -38,8 +45,10 @@ from .object import (
     ContractData,
     Exchange
 )
+from .constant import Direction, Offset, Product
 from .setting import SETTINGS
-from .utility import TRADER_DIR
+from .utility import TRADER_DIR, get_file_path
+from .history import HistoryRetention, HistoryArchive
 from .converter import OffsetConverter
 from .logger import logger, DEBUG, INFO, WARNING, ERROR, CRITICAL
 from .locale import _
@@ -83,6 +92,8 @@ class MainEngine:
             self.event_engine = EventEngine()
         self.event_engine.start()
 
+        self.tracer: LatencyTracer | None = self.event_engine.get_tracer()
+
         self.gateways: dict[str, BaseGateway] = {}
         self.engines: dict[str, BaseEngine] = {}
         self.apps: dict[str, BaseApp] = {}
@@ -150,9 +161,20 @@ class MainEngine:
         self.get_all_quotes: Callable[[], list[QuoteData]] = oms_engine.get_all_quotes
         self.get_all_active_orders: Callable[[], list[OrderData]] = oms_engine.get_all_active_orders
         self.get_all_active_quotes: Callable[[], list[QuoteData]] = oms_engine.get_all_active_quotes
+        self.get_orders: Callable[[str, str, Direction | None], list[OrderData]] = oms_engine.get_orders
+        self.get_active_orders: Callable[[str, str, Direction | None], list[OrderData]] = oms_engine.get_active_orders
+        self.get_trades: Callable[[str, str, Direction | None], list[TradeData]] = oms_engine.get_trades
+        self.get_positions: Callable[[str, str, Direction | None], list[PositionData]] = oms_engine.get_positions
+        self.get_quotes: Callable[[str, str], list[QuoteData]] = oms_engine.get_quotes
+        self.get_active_quotes: Callable[[str, str], list[QuoteData]] = oms_engine.get_active_quotes
         self.update_order_request: Callable[[OrderRequest, str, str], None] = oms_engine.update_order_request
         self.convert_order_request: Callable[[OrderRequest, str, bool, bool], list[OrderRequest]] = oms_engine.convert_order_request
         self.get_converter: Callable[[str], OffsetConverter | None] = oms_engine.get_converter
+        self.get_contracts: Callable[[Exchange | None, Product | None, str, str, date | None], list[ContractData]] = oms_engine.get_contracts
+        self.get_snapshot: Callable[[], OmsSnapshot] = oms_engine.get_snapshot
+        self.get_changes: Callable[[int], list[tuple[int, str, str, Any]] | None] = oms_engine.get_changes
+
+        self.risk_engine: RiskEngine = self.add_engine(RiskEngine)
 
         email_engine: EmailEngine = self.add_engine(EmailEngine)
         self.send_email: Callable[[str, str, str | None], None] = email_engine.send_email
@@ -230,12 +252,32 @@ class MainEngine:
         """
         Send new order request to a specific gateway.
         """
+        # Stamp latency trace if sent during processing a traced event
+        trace: Trace | None = None
+        if self.tracer:
+            trace = self.tracer.get_current()
+            if trace:
+                self.tracer.stamp(trace, "main_send_order")
+
         gateway: BaseGateway | None = self.get_gateway(gateway_name)
-        if gateway:
-            return gateway.send_order(req)
-        else:
+        if not gateway:
+            return ""
+
+        # Pre-trade risk check
+        if not self.risk_engine.check_order(req, gateway_name):
             return ""
 
+        if trace and self.tracer:
+            self.tracer.stamp(trace, "gateway_send_order")
+
+        vt_orderid: str = gateway.send_order(req)
+
+        if trace and self.tracer:
+            self.tracer.finish(trace, "order_sent", "tick_to_trade")
+
+        self.risk_engine.update_order_request(req, vt_orderid)
+        return vt_orderid
+
     def cancel_order(self, req: CancelRequest, gateway_name: str) -> None:
         """
         Send cancel order request to a specific gateway.
@@ -244,16 +286,72 @@ class MainEngine:
         if gateway:
             gateway.cancel_order(req)
 
+    def send_orders(self, reqs: list[OrderRequest], gateway_name: str) -> list[str]:
+        """
+        Send a batch of new order requests to a specific gateway, and
+        return vt_orderids in the same sequence of reqs ("" for those
+        rejected by risk check or failed to send).
+        """
+        trace: Trace | None = None
+        if self.tracer:
+            trace = self.tracer.get_current()
+            if trace:
+                self.tracer.stamp(trace, "main_send_order")
+
+        gateway: BaseGateway | None = self.get_gateway(gateway_name)
+        if not gateway:
+            return [""] * len(reqs)
+
+        # Pre-trade risk check of each order
+        checks: list[bool] = self.risk_engine.check_orders(reqs, gateway_name)
+        send_reqs: list[OrderRequest] = [req for req, check in zip(reqs, checks, strict=True) if check]
+
+        if trace and self.tracer:
+            self.tracer.stamp(trace, "gateway_send_order")
+
+        sent_orderids: list[str] = gateway.send_orders(send_reqs) if send_reqs else []
+
+        if trace and self.tracer:
+            self.tracer.finish(trace, "order_sent", "tick_to_trade")
+
+        # Gateway may return fewer vt_orderids than requests sent
+        for req, vt_orderid in zip(send_reqs, sent_orderids, strict=False):
+            self.risk_engine.update_order_request(req, vt_orderid)
+
+        # Put results back into sequence of reqs
+        results: list[str] = []
+        sent_iter: Iterator[str] = iter(sent_orderids)
+
+        for check in checks:
+            if check:
+                results.append(next(sent_iter, ""))
+            else:
+                results.append("")
+
+        return results
+
+    def cancel_orders(self, reqs: list[CancelRequest], gateway_name: str) -> None:
+        """
+        Send a batch of cancel order requests to a specific gateway.
+        """
+        gateway: BaseGateway | None = self.get_gateway(gateway_name)
+        if gateway:
+            gateway.cancel_orders(reqs)
+
     def send_quote(self, req: QuoteRequest, gateway_name: str) -> str:
         """
         Send new quote request to a specific gateway.
         """
         gateway: BaseGateway | None = self.get_gateway(gateway_name)
-        if gateway:
-            return gateway.send_quote(req)
-        else:
+        if not gateway:
             return ""
 
+        # Pre-trade risk check
+        if not self.risk_engine.check_quote(req, gateway_name):
+            return ""
+
+        return gateway.send_quote(req)
+
     def cancel_quote(self, req: CancelRequest, gateway_name: str) -> None:
         """
         Send cancel quote request to a specific gateway.
@@ -322,6 +420,190 @@ class LogEngine(BaseEngine):
         self.event_engine.register(event_type, self.process_log_event)
 
 
+class DataIndex:
+    """
+    Secondary index of OMS data by vt_symbol, gateway_name and direction.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.symbol_map: defaultdict[str, dict[str, Any]] = defaultdict(dict)
+        self.gateway_map: defaultdict[str, dict[str, Any]] = defaultdict(dict)
+        self.direction_map: defaultdict[Direction | None, dict[str, Any]] = defaultdict(dict)
+
+    def add(self, vt_id: str, data: Any) -> None:
+        """
+        Add or update data in index.
+        """
+        self.symbol_map[data.vt_symbol][vt_id] = data
+        self.gateway_map[data.gateway_name][vt_id] = data
+        self.direction_map[getattr(data, "direction", None)][vt_id] = data
+
+    def remove(self, vt_id: str, data: Any) -> None:
+        """
+        Remove data from index.
+        """
+        self._remove(self.symbol_map, data.vt_symbol, vt_id)
+        self._remove(self.gateway_map, data.gateway_name, vt_id)
+        self._remove(self.direction_map, getattr(data, "direction", None), vt_id)
+
+    def _remove(self, index_map: defaultdict, key: Any, vt_id: str) -> None:
+        """"""
+        bucket: dict | None = index_map.get(key, None)
+        if bucket is None:
+            return
+
+        bucket.pop(vt_id, None)
+
+        if not bucket:
+            index_map.pop(key)
+
+    def query(
+        self,
+        vt_symbol: str = "",
+        gateway_name: str = "",
+        direction: Direction | None = None
+    ) -> list:
+        """
+        Get data matching all given conditions, starting from the
+        smallest bucket so that cost is proportional to the result.
+        """
+        buckets: list[dict] = []
+
+        if vt_symbol:
+            buckets.append(self.symbol_map.get(vt_symbol, {}))
+        if gateway_name:
+            buckets.append(self.gateway_map.get(gateway_name, {}))
+        if direction:
+            buckets.append(self.direction_map.get(direction, {}))
+
+        # Buckets are copied before iterating, since they may be changed
+        # by event thread while queried from other threads
+        if not buckets:
+            return [
+                data
+                for bucket in list(self.gateway_map.values())
+                for data in list(bucket.values())
+            ]
+
+        buckets.sort(key=len)
+        items: list[tuple[str, Any]] = list(buckets[0].items())
+        others: list[dict] = buckets[1:]
+
+        return [
+            data for vt_id, data in items
+            if all(vt_id in bucket for bucket in others)
+        ]
+
+
+class ContractIndex:
+    """
+    Index of contracts by exchange, product, option underlying, option
+    portfolio and option expiry date.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.exchange_map: dict[Exchange, dict[str, ContractData]] = {}
+        self.product_map: dict[Product, dict[str, ContractData]] = {}
+        self.underlying_map: dict[str, dict[str, ContractData]] = {}
+        self.portfolio_map: dict[str, dict[str, ContractData]] = {}
+        self.expiry_map: dict[date, dict[str, ContractData]] = {}
+
+    def get_keys(self, contract: ContractData) -> list[tuple[dict, Any]]:
+        """"""
+        keys: list[tuple[dict, Any]] = [
+            (self.exchange_map, contract.exchange),
+            (self.product_map, contract.product)
+        ]
+
+        if contract.option_underlying:
+            keys.append((self.underlying_map, contract.option_underlying))
+        if contract.option_portfolio:
+            keys.append((self.portfolio_map, contract.option_portfolio))
+        if contract.option_expiry:
+            keys.append((self.expiry_map, contract.option_expiry.date()))
+
+        return keys
+
+    def add(self, contract: ContractData) -> None:
+        """
+        Add contract into index.
+        """
+        for index_map, key in self.get_keys(contract):
+            bucket: dict[str, ContractData] | None = index_map.get(key, None)
+
+            if bucket is None:
+                bucket = {}
+                index_map[key] = bucket
+
+            bucket[contract.vt_symbol] = contract
+
+    def remove(self, contract: ContractData) -> None:
+        """
+        Remove contract from index.
+        """
+        for index_map, key in self.get_keys(contract):
+            bucket: dict[str, ContractData] | None = index_map.get(key, None)
+
+            if bucket is not None:
+                bucket.pop(contract.vt_symbol, None)
+
+    def query(
+        self,
+        exchange: Exchange | None = None,
+        product: Product | None = None,
+        option_underlying: str = "",
+        option_portfolio: str = "",
+        option_expiry: date | None = None
+    ) -> list[ContractData]:
+        """
+        Get contracts matching all given conditions. Buckets are copied
+        before iterating, so it is safe to query while adding contracts.
+        """
+        buckets: list[dict] = []
+
+        if exchange:
+            buckets.append(self.exchange_map.get(exchange, {}))
+        if product:
+            buckets.append(self.product_map.get(product, {}))
+        if option_underlying:
+            buckets.append(self.underlying_map.get(option_underlying, {}))
+        if option_portfolio:
+            buckets.append(self.portfolio_map.get(option_portfolio, {}))
+        if option_expiry:
+            buckets.append(self.expiry_map.get(option_expiry, {}))
+
+        if not buckets:
+            return [
+                contract
+                for bucket in list(self.exchange_map.values())
+                for contract in list(bucket.values())
+            ]
+
+        buckets.sort(key=len)
+        items: list[tuple[str, ContractData]] = list(buckets[0].items())
+        others: list[dict] = buckets[1:]
+
+        return [
+            contract for vt_symbol, contract in items
+            if all(vt_symbol in bucket for bucket in others)
+        ]
+
+
+@dataclass(frozen=True)
+class OmsSnapshot:
+    """
+    Read-only view of OMS data at a sequence number.
+    """
+
+    seq: int
+    orders: Mapping[str, OrderData]
+    trades: Mapping[str, TradeData]
+    positions: Mapping[str, PositionData]
+    accounts: Mapping[str, AccountData]
+
+
 class OmsEngine(BaseEngine):
     """
     Provides order management system function.
@@ -342,8 +624,41 @@ class OmsEngine(BaseEngine):
         self.active_orders: dict[str, OrderData] = {}
         self.active_quotes: dict[str, QuoteData] = {}
 
+        # Secondary indexes for querying data by conditions
+        self.order_index: DataIndex = DataIndex()
+        self.active_order_index: DataIndex = DataIndex()
+        self.trade_index: DataIndex = DataIndex()
+        self.position_index: DataIndex = DataIndex()
+        self.quote_index: DataIndex = DataIndex()
+        self.active_quote_index: DataIndex = DataIndex()
+
         self.offset_converters: dict[str, OffsetConverter] = {}
 
+        # Contract index is built lazily on first query, lock is only
+        # used when adding contracts or building index, not for query.
+        self.contract_index: ContractIndex | None = None
+        self.contract_lock: Lock = Lock()
+
+        # Retention of inactive orders and trades, evicted ones are
+        # moved into on-disk archive to keep memory usage flat.
+        history_count: int = SETTINGS["oms.history_count"]
+        history_seconds: float = SETTINGS["oms.history_minutes"] * 60
+
+        self.order_retention: HistoryRetention = HistoryRetention(history_count, history_seconds)
+        self.trade_retention: HistoryRetention = HistoryRetention(history_count, history_seconds)
+
+        self.archive: HistoryArchive | None = None
+        if self.order_retention.is_enabled():
+            self.archive = HistoryArchive(get_file_path(SETTINGS["oms.history_filename"]))
+
+        # Copy-on-write snapshot of orders, trades, positions and accounts.
+        # Data dicts shared with a snapshot are copied before next change.
+        self.seq: int = 0
+        self.snapshot: OmsSnapshot | None = None
+        self.snapshot_lock: Lock = Lock()
+        self.shared_names: set[str] = set()
+        self.changes: deque[tuple[int, str, str, Any]] = deque(maxlen=SETTINGS["oms.change_count"])
+
         self.register_event()
 
     def register_event(self) -> None:
@@ -354,6 +669,7 @@ class OmsEngine(BaseEngine):
         self.event_engine.register(EVENT_POSITION, self.process_position_event)
         self.event_engine.register(EVENT_ACCOUNT, self.process_account_event)
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
+        self.event_engine.register(EVENT_CONTRACTS, self.process_contracts_event)
         self.event_engine.register(EVENT_QUOTE, self.process_quote_event)
 
     def process_tick_event(self, event: Event) -> None:
@@ -364,34 +680,52 @@ class OmsEngine(BaseEngine):
     def process_order_event(self, event: Event) -> None:
         """"""
         order: OrderData = event.data
-        self.orders[order.vt_orderid] = order
+        self.update_data("orders", order.vt_orderid, order)
+        self.order_index.add(order.vt_orderid, order)
 
         # If order is active, then update data in dict.
         if order.is_active():
             self.active_orders[order.vt_orderid] = order
+            self.active_order_index.add(order.vt_orderid, order)
         # Otherwise, pop inactive order from in dict
         elif order.vt_orderid in self.active_orders:
             self.active_orders.pop(order.vt_orderid)
+            self.active_order_index.remove(order.vt_orderid, order)
 
         # Update to offset converter
         converter: OffsetConverter | None = self.offset_converters.get(order.gateway_name, None)
         if converter:
             converter.update_order(order)
 
+        # Evict inactive orders exceeding retention limits
+        if self.archive:
+            if order.is_active():
+                self.order_retention.remove(order.vt_orderid)
+            else:
+                evicted: list[str] = self.order_retention.add(order.vt_orderid)
+                self.evict_data(evicted, "orders", self.order_index, "dborder")
+
     def process_trade_event(self, event: Event) -> None:
         """"""
         trade: TradeData = event.data
-        self.trades[trade.vt_tradeid] = trade
+        self.update_data("trades", trade.vt_tradeid, trade)
+        self.trade_index.add(trade.vt_tradeid, trade)
 
         # Update to offset converter
         converter: OffsetConverter | None = self.offset_converters.get(trade.gateway_name, None)
         if converter:
             converter.update_trade(trade)
 
+        # Evict trades exceeding retention limits
+        if self.archive:
+            evicted: list[str] = self.trade_retention.add(trade.vt_tradeid)
+            self.evict_data(evicted, "trades", self.trade_index, "dbtrade")
+
     def process_position_event(self, event: Event) -> None:
         """"""
         position: PositionData = event.data
-        self.positions[position.vt_positionid] = position
+        self.update_data("positions", position.vt_positionid, position)
+        self.position_index.add(position.vt_positionid, position)
 
         # Update to offset converter
         converter: OffsetConverter | None = self.offset_converters.get(position.gateway_name, None)
@@ -401,13 +735,34 @@ class OmsEngine(BaseEngine):
     def process_account_event(self, event: Event) -> None:
         """"""
         account: AccountData = event.data
-        self.accounts[account.vt_accountid] = account
+        self.update_data("accounts", account.vt_accountid, account)
 
     def process_contract_event(self, event: Event) -> None:
         """"""
         contract: ContractData = event.data
+
+        with self.contract_lock:
+            self.add_contract(contract)
+
+    def process_contracts_event(self, event: Event) -> None:
+        """"""
+        contracts: list[ContractData] = event.data
+
+        with self.contract_lock:
+            for contract in contracts:
+                self.add_contract(contract)
+
+    def add_contract(self, contract: ContractData) -> None:
+        """"""
+        old_contract: ContractData | None = self.contracts.get(contract.vt_symbol, None)
         self.contracts[contract.vt_symbol] = contract
 
+        # Update index if already built
+        if self.contract_index:
+            if old_contract:
+                self.contract_index.remove(old_contract)
+            self.contract_index.add(contract)
+
         # Initialize offset converter for each gateway
         if contract.gateway_name not in self.offset_converters:
             self.offset_converters[contract.gateway_name] = OffsetConverter(self)
@@ -416,13 +771,115 @@ class OmsEngine(BaseEngine):
         """"""
         quote: QuoteData = event.data
         self.quotes[quote.vt_quoteid] = quote
+        self.quote_index.add(quote.vt_quoteid, quote)
 
         # If quote is active, then update data in dict.
         if quote.is_active():
             self.active_quotes[quote.vt_quoteid] = quote
+            self.active_quote_index.add(quote.vt_quoteid, quote)
         # Otherwise, pop inactive quote from in dict
         elif quote.vt_quoteid in self.active_quotes:
             self.active_quotes.pop(quote.vt_quoteid)
+            self.active_quote_index.remove(quote.vt_quoteid, quote)
+
+    def update_data(self, name: str, vt_id: str, data: Any | None) -> None:
+        """
+        Update (or remove if data is None) data in dict with name, and
+        record the change with a new sequence number.
+        """
+        with self.snapshot_lock:
+            data_map: dict = getattr(self, name)
+
+            # Copy dict shared with snapshot before changing it
+            if name in self.shared_names:
+                data_map = data_map.copy()
+                setattr(self, name, data_map)
+                self.shared_names.remove(name)
+
+            if data is None:
+                data_map.pop(vt_id, None)
+            else:
+                data_map[vt_id] = data
+
+            self.seq += 1
+            self.changes.append((self.seq, name, vt_id, data))
+
+    def evict_data(
+        self,
+        vt_ids: list[str],
+        name: str,
+        index: DataIndex,
+        table: str
+    ) -> None:
+        """
+        Remove data from memory and append them into archive.
+        """
+        if not vt_ids or not self.archive:
+            return
+
+        data_map: dict = getattr(self, name)
+        records: list[tuple[str, Any]] = []
+
+        for vt_id in vt_ids:
+            data: Any = data_map.get(vt_id, None)
+            if data is None:
+                continue
+
+            self.update_data(name, vt_id, None)
+            index.remove(vt_id, data)
+            records.append((vt_id, data))
+
+        self.archive.save(table, records)
+
+    def close(self) -> None:
+        """"""
+        if self.archive:
+            self.archive.close()
+
+    def get_snapshot(self) -> OmsSnapshot:
+        """
+        Get read-only snapshot of orders, trades, positions and accounts.
+
+        The snapshot shares dicts with OMS engine without copying, and is
+        safe to be read from other threads while data keeps updating.
+        """
+        with self.snapshot_lock:
+            if not self.snapshot or self.snapshot.seq != self.seq:
+                self.snapshot = OmsSnapshot(
+                    seq=self.seq,
+                    orders=MappingProxyType(self.orders),
+                    trades=MappingProxyType(self.trades),
+                    positions=MappingProxyType(self.positions),
+                    accounts=MappingProxyType(self.accounts)
+                )
+                self.shared_names.update(("orders", "trades", "positions", "accounts"))
+
+            return self.snapshot
+
+    def get_changes(self, seq: int) -> list[tuple[int, str, str, Any]] | None:
+        """
+        Get changes after sequence number, each one is a tuple of
+        (seq, name, vt_id, data) with data None for removed ones.
+
+        None is returned if changes after seq are no longer kept, and
+        a full snapshot should be used instead.
+        """
+        with self.snapshot_lock:
+            if seq >= self.seq:
+                return []
+
+            if not self.changes or self.changes[0][0] > seq + 1:
+                return None
+
+            changes: list[tuple[int, str, str, Any]] = []
+
+            for change in reversed(self.changes):
+                if change[0] <= seq:
+                    break
+                changes.append(change)
+
+        changes.reverse()
+        return changes
 
     def get_tick(self, vt_symbol: str) -> TickData | None:
         """
@@ -432,15 +889,27 @@ class OmsEngine(BaseEngine):
 
     def get_order(self, vt_orderid: str) -> OrderData | None:
         """
-        Get latest order data by vt_orderid.
+        Get latest order data by vt_orderid, evicted orders
+        are loaded from archive.
         """
-        return self.orders.get(vt_orderid, None)
+        order: OrderData | None = self.orders.get(vt_orderid, None)
+
+        if order is None and self.archive:
+            order = self.archive.load("dborder", vt_orderid)
+
+        return order
 
     def get_trade(self, vt_tradeid: str) -> TradeData | None:
         """
-        Get trade data by vt_tradeid.
+        Get trade data by vt_tradeid, evicted trades are
+        loaded from archive.
         """
-        return self.trades.get(vt_tradeid, None)
+        trade: TradeData | None = self.trades.get(vt_tradeid, None)
+
+        if trade is None and self.archive:
+            trade = self.archive.load("dbtrade", vt_tradeid)
+
+        return trade
 
     def get_position(self, vt_positionid: str) -> PositionData | None:
         """
@@ -474,13 +943,13 @@ class OmsEngine(BaseEngine):
 
     def get_all_orders(self) -> list[OrderData]:
         """
-        Get all order data.
+        Get all order data in memory.
         """
         return list(self.orders.values())
 
     def get_all_trades(self) -> list[TradeData]:
         """
-        Get all trade data.
+        Get all trade data in memory.
         """
         return list(self.trades.values())
 
@@ -502,6 +971,37 @@ class OmsEngine(BaseEngine):
         """
         return list(self.contracts.values())
 
+    def get_contracts(
+        self,
+        exchange: Exchange | None = None,
+        product: Product | None = None,
+        option_underlying: str = "",
+        option_portfolio: str = "",
+        option_expiry: date | None = None
+    ) -> list[ContractData]:
+        """
+        Get contracts filtered by exchange, product, underlying, portfolio
+        and expiry date of option.
+
+        Contract index is built on first query, and then updated along
+        with new contracts.
+        """
+        if not self.contract_index:
+            with self.contract_lock:
+                if not self.contract_index:
+                    contract_index: ContractIndex = ContractIndex()
+                    for contract in self.contracts.values():
+                        contract_index.add(contract)
+                    self.contract_index = contract_index
+
+        return self.contract_index.query(
+            exchange,
+            product,
+            option_underlying,
+            option_portfolio,
+            option_expiry
+        )
+
     def get_all_quotes(self) -> list[QuoteData]:
         """
         Get all quote data.
@@ -520,6 +1020,62 @@ class OmsEngine(BaseEngine):
         """
         return list(self.active_quotes.values())
 
+    def get_orders(
+        self,
+        vt_symbol: str = "",
+        gateway_name: str = "",
+        direction: Direction | None = None
+    ) -> list[OrderData]:
+        """
+        Get orders filtered by vt_symbol, gateway_name and direction.
+        """
+        return self.order_index.query(vt_symbol, gateway_name, direction)
+
+    def get_active_orders(
+        self,
+        vt_symbol: str = "",
+        gateway_name: str = "",
+        direction: Direction | None = None
+    ) -> list[OrderData]:
+        """
+        Get active orders filtered by vt_symbol, gateway_name and direction.
+        """
+        return self.active_order_index.query(vt_symbol, gateway_name, direction)
+
+    def get_trades(
+        self,
+        vt_symbol: str = "",
+        gateway_name: str = "",
+        direction: Direction | None = None
+    ) -> list[TradeData]:
+        """
+        Get trades filtered by vt_symbol, gateway_name and direction.
+        """
+        return self.trade_index.query(vt_symbol, gateway_name, direction)
+
+    def get_positions(
+        self,
+        vt_symbol: str = "",
+        gateway_name: str = "",
+        direction: Direction | None = None
+    ) -> list[PositionData]:
+        """
+        Get positions filtered by vt_symbol, gateway_name and direction.
+        """
+        return self.position_index.query(vt_symbol, gateway_name, direction)
+
+    def get_quotes(self, vt_symbol: str = "", gateway_name: str = "") -> list[QuoteData]:
+        """
+        Get quotes filtered by vt_symbol and gateway_name.
+        """
+        return self.quote_index.query(vt_symbol, gateway_name)
+
+    def get_active_quotes(self, vt_symbol: str = "", gateway_name: str = "") -> list[QuoteData]:
+        """
+        Get active quotes filtered by vt_symbol and gateway_name.
+        """
+        return self.active_quote_index.query(vt_symbol, gateway_name)
+
     def update_order_request(self, req: OrderRequest, vt_orderid: str, gateway_name: str) -> None:
         """
         Update order request to offset converter.
@@ -552,6 +1108,330 @@ class OmsEngine(BaseEngine):
         return self.offset_converters.get(gateway_name, None)
 
 
+class PriceLevels:
+    """
+    Count of active orders at each price, with best price cached.
+    """
+
+    def __init__(self, direction: Direction) -> None:
+        """"""
+        self.direction: Direction = direction
+        self.counts: dict[float, int] = {}
+        self.best: float | None = None
+
+    def add(self, price: float) -> None:
+        """"""
+        self.counts[price] = self.counts.get(price, 0) + 1
+
+        if (
+            self.best is None
+            or (self.direction == Direction.LONG and price > self.best)
+            or (self.direction == Direction.SHORT and price < self.best)
+        ):
+            self.best = price
+
+    def remove(self, price: float) -> None:
+        """"""
+        count: int = self.counts.get(price, 0) - 1
+
+        if count > 0:
+            self.counts[price] = count
+            return
+
+        self.counts.pop(price, None)
+
+        # Only search remaining price levels when best one is removed
+        if price == self.best:
+            if not self.counts:
+                self.best = None
+            elif self.direction == Direction.LONG:
+                self.best = max(self.counts)
+            else:
+                self.best = min(self.counts)
+
+
+class RiskEngine(BaseEngine):
+    """
+    Provides pre-trade risk check of orders and quotes.
+
+    All checks use counters maintained incrementally with order updates,
+    so that no scanning of orders is needed for each check. A limit of 0
+    means the check is disabled.
+
+    Counters are guarded by lock, since orders are checked and sent in
+    caller threads while order updates come from event thread.
+    """
+
+    UPDATED_ORDERID_LIMIT: int = 10000
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
+        """"""
+        super().__init__(main_engine, event_engine, "risk")
+
+        self.active: bool = SETTINGS["risk.active"]
+        self.order_rate_limit: int = SETTINGS["risk.order_rate_limit"]          # orders per second
+        self.active_order_limit: int = SETTINGS["risk.active_order_limit"]      # all active orders
+        self.notional_limit: float = SETTINGS["risk.notional_limit"]            # active notional per symbol
+        self.position_limit: float = SETTINGS["risk.position_limit"]            # position per symbol and direction
+        self.self_cross_check: bool = SETTINGS["risk.self_cross_check"]
+
+        # Send time of orders in last second
+        self.send_times: deque[float] = deque()
+
+        # Active orders tracked since sent, and counters of them
+        self.orders: dict[str, OrderData] = {}
+        self.notionals: defaultdict[str, float] = defaultdict(float)
+        self.open_volumes: defaultdict[tuple[str, Direction], float] = defaultdict(float)
+        self.price_levels: dict[tuple[str, Direction], PriceLevels] = {}
+
+        self.reject_counts: defaultdict[str, int] = defaultdict(int)
+
+        # Orders updated by gateway before being tracked, which may arrive
+        # before send_order returns. Removed when request is tracked, and
+        # limited in size for orders not sent from this process.
+        self.updated_orderids: OrderedDict[str, None] = OrderedDict()
+
+        self.lock: Lock = Lock()
+
+        self.register_event()
+
+    def register_event(self) -> None:
+        """"""
+        self.event_engine.register(EVENT_ORDER, self.process_order_event)
+
+    def process_order_event(self, event: Event) -> None:
+        """"""
+        if not self.active:
+            return
+
+        order: OrderData = event.data
+
+        with self.lock:
+            if order.vt_orderid not in self.orders:
+                self.updated_orderids[order.vt_orderid] = None
+
+                if len(self.updated_orderids) > self.UPDATED_ORDERID_LIMIT:
+                    self.updated_orderids.popitem(last=False)
+
+            self.update_order(order)
+
+    def update_order_request(self, req: OrderRequest, vt_orderid: str) -> None:
+        """
+        Track order sent before its first update from gateway. Request
+        is ignored if the order has already been updated, for example
+        rejected or traded by gateway synchronously.
+        """
+        if not self.active or not vt_orderid:
+            return
+
+        gateway_name, orderid = vt_orderid.split(".", 1)
+        order: OrderData = req.create_order_data(orderid, gateway_name)
+
+        with self.lock:
+            if vt_orderid in self.updated_orderids:
+                self.updated_orderids.pop(vt_orderid)
+                return
+            self.update_order(order)
+
+    def update_order(self, order: OrderData) -> None:
+        """
+        Apply change of order to counters.
+        """
+        old_order: OrderData | None = self.orders.pop(order.vt_orderid, None)
+        if old_order:
+            self.apply_order(old_order, -1)
+
+        if order.is_active():
+            self.orders[order.vt_orderid] = order
+            self.apply_order(order, 1)
+
+    def apply_order(self, order: OrderData, sign: int) -> None:
+        """
+        Add (sign 1) or remove (sign -1) order from counters.
+        """
+        volume: float = order.volume - order.traded
+        size: float = self.get_size(order.vt_symbol)
+
+        self.notionals[order.vt_symbol] += sign * volume * order.price * size
+
+        if order.direction and order.offset in {Offset.NONE, Offset.OPEN}:
+            self.open_volumes[(order.vt_symbol, order.direction)] += sign * volume
+
+        if order.price and order.direction:
+            levels: PriceLevels = self.get_price_levels(order.vt_symbol, order.direction)
+            if sign > 0:
+                levels.add(order.price)
+            else:
+                levels.remove(order.price)
+
+    def get_size(self, vt_symbol: str) -> float:
+        """"""
+        contract: ContractData | None = self.main_engine.get_contract(vt_symbol)
+        if contract:
+            return contract.size
+        return 1
+
+    def get_price_levels(self, vt_symbol: str, direction: Direction) -> PriceLevels:
+        """"""
+        key: tuple[str, Direction] = (vt_symbol, direction)
+
+        levels: PriceLevels | None = self.price_levels.get(key, None)
+        if not levels:
+            levels = PriceLevels(direction)
+            self.price_levels[key] = levels
+
+        return levels
+
+    def check_rate(self) -> bool:
+        """
+        Check order rate in sliding window of last second.
+        """
+        if not self.order_rate_limit:
+            return True
+
+        now: float = monotonic()
+        while self.send_times and now - self.send_times[0] >= 1:
+            self.send_times.popleft()
+
+        return len(self.send_times) < self.order_rate_limit
+
+    def is_cross(self, vt_symbol: str, direction: Direction, price: float) -> bool:
+        """
+        Check if price crosses active orders of opposite direction.
+        """
+        if direction == Direction.LONG:
+            levels: PriceLevels | None = self.price_levels.get((vt_symbol, Direction.SHORT), None)
+            return bool(levels and levels.best is not None and price >= levels.best)
+        elif direction == Direction.SHORT:
+            levels = self.price_levels.get((vt_symbol, Direction.LONG), None)
+            return bool(levels and levels.best is not None and price <= levels.best)
+        return False
+
+    def check_order(self, req: OrderRequest, gateway_name: str) -> bool:
+        """
+        Check order request before sending, return False if rejected.
+        """
+        if not self.active:
+            return True
+
+        with self.lock:
+            rejected: tuple[str, str] | None = self.check_order_rules(req, gateway_name)
+
+        if rejected:
+            return self.reject(*rejected)
+        return True
+
+    def check_order_rules(self, req: OrderRequest, gateway_name: str) -> tuple[str, str] | None:
+        """
+        Check order request by all rules, return rule and message if rejected.
+        Must be called with lock acquired.
+        """
+        if not self.check_rate():
+            return "order_rate", _("委托频率超过限制：{}/秒").format(self.order_rate_limit)
+
+        if self.active_order_limit and len(self.orders) >= self.active_order_limit:
+            return "active_order", _("活动委托数量超过限制：{}").format(self.active_order_limit)
+
+        if self.notional_limit:
+            notional: float = req.volume * req.price * self.get_size(req.vt_symbol)
+            if self.notionals[req.vt_symbol] + notional > self.notional_limit:
+                return "notional", _("{}委托金额超过限制：{}").format(req.vt_symbol, self.notional_limit)
+
+        if self.position_limit and req.offset in {Offset.NONE, Offset.OPEN}:
+            vt_positionid: str = f"{gateway_name}.{req.vt_symbol}.{req.direction.value}"
+            position: PositionData | None = self.main_engine.get_position(vt_positionid)
+
+            volume: float = req.volume + self.open_volumes[(req.vt_symbol, req.direction)]
+            if position:
+                volume += position.volume
+
+            if volume > self.position_limit:
+                return "position", _("{}持仓超过限制：{}").format(req.vt_symbol, self.position_limit)
+
+        if self.self_cross_check and req.price and self.is_cross(req.vt_symbol, req.direction, req.price):
+            return "self_cross", _("{}委托价格与活动委托自成交").format(req.vt_symbol)
+
+        self.send_times.append(monotonic())
+        return None
+
+    def check_orders(self, reqs: list[OrderRequest], gateway_name: str) -> list[bool]:
+        """
+        Check a batch of order requests, orders passed are counted when
+        checking the following ones of the same batch.
+        """
+        if not self.active:
+            return [True] * len(reqs)
+
+        checks: list[bool] = []
+        rejects: list[tuple[str, str]] = []
+        pending_orders: list[OrderData] = []
+
+        with self.lock:
+            for req in reqs:
+                rejected: tuple[str, str] | None = self.check_order_rules(req, gateway_name)
+                checks.append(not rejected)
+
+                if rejected:
+                    rejects.append(rejected)
+                else:
+                    order: OrderData = req.create_order_data(str(len(pending_orders)), "RiskPending")
+                    self.update_order(order)
+                    pending_orders.append(order)
+
+            # Remove pending orders, which are tracked again after sent
+            for order in pending_orders:
+                self.orders.pop(order.vt_orderid)
+                self.apply_order(order, -1)
+
+        for rule, msg in rejects:
+            self.reject(rule, msg)
+
+        return checks
+
+    def check_quote(self, req: QuoteRequest, gateway_name: str) -> bool:
+        """
+        Check quote request before sending, return False if rejected.
+        """
+        if not self.active:
+            return True
+
+        with self.lock:
+            if not self.check_rate():
+                rejected: tuple[str, str] | None = (
+                    "order_rate", _("委托频率超过限制：{}/秒").format(self.order_rate_limit)
+                )
+            elif self.self_cross_check and (
+                (req.bid_price and req.ask_price and req.bid_price >= req.ask_price)
+                or (req.bid_price and self.is_cross(req.vt_symbol, Direction.LONG, req.bid_price))
+                or (req.ask_price and self.is_cross(req.vt_symbol, Direction.SHORT, req.ask_price))
+            ):
+                rejected = ("self_cross", _("{}报价与活动委托自成交").format(req.vt_symbol))
+            else:
+                rejected = None
+                self.send_times.append(monotonic())
+
+        if rejected:
+            return self.reject(*rejected)
+        return True
+
+    def reject(self, rule: str, msg: str) -> bool:
+        """
+        Count reject of rule and write log, called without lock acquired
+        since writing log may block on full event queue.
+        """
+        with self.lock:
+            self.reject_counts[rule] += 1
+
+        self.main_engine.write_log(_("风控拦截：{}").format(msg), "RiskEngine")
+        return False
+
+    def get_reject_counts(self) -> dict[str, int]:
+        """
+        Get count of rejects for each rule.
+        """
+        return dict(self.reject_counts)
+
+
 class EmailEngine(BaseEngine):
     """
     Provides email sending function.
@@ -11,4 +11,22 @@ EVENT_POSITION = "ePosition."
 EVENT_ACCOUNT = "eAccount."
 EVENT_QUOTE = "eQuote."
 EVENT_CONTRACT = "eContract."
+EVENT_CONTRACTS = "eContracts."
 EVENT_LOG = "eLog"
+
+
+# Priority of event types used by priority lanes of event engine,
+# lower number means higher priority and is processed first.
+# Contracts share the lane of positions and orders, which depend on
+# contract data pushed before them.
+EVENT_PRIORITIES: dict[str, int] = {
+    EVENT_CONTRACT: 0,
+    EVENT_CONTRACTS: 0,
+    EVENT_ORDER: 0,
+    EVENT_TRADE: 0,
+    EVENT_ACCOUNT: 0,
+    EVENT_POSITION: 0,
+    EVENT_QUOTE: 0,
+    EVENT_TICK: 2,
+    EVENT_LOG: 2,
+}
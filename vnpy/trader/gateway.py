@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 
-from vnpy.event import Event, EventEngine
+from vnpy.event import Event, EventEngine, LatencyTracer
 from .event import (
     EVENT_TICK,
     EVENT_ORDER,
@@ -8,6 +8,7 @@ from .event import (
     EVENT_POSITION,
     EVENT_ACCOUNT,
     EVENT_CONTRACT,
+    EVENT_CONTRACTS,
     EVENT_LOG,
     EVENT_QUOTE,
 )
@@ -82,61 +83,62 @@ class BaseGateway(ABC):
         """"""
         self.event_engine: EventEngine = event_engine
         self.gateway_name: str = gateway_name
+        self.tracer: LatencyTracer | None = event_engine.get_tracer()
 
-    def on_event(self, type: str, data: object = None) -> None:
+    def on_event(self, type: str, data: object = None, key: str = "") -> None:
         """
         General event push.
         """
-        event: Event = Event(type, data)
+        event: Event = Event(type, data, key)
         self.event_engine.put(event)
 
     def on_tick(self, tick: TickData) -> None:
         """
         Tick event push.
-        Tick event of a specific vt_symbol is also pushed.
+        Handlers of EVENT_TICK + vt_symbol also receive the event.
         """
-        self.on_event(EVENT_TICK, tick)
-        self.on_event(EVENT_TICK + tick.vt_symbol, tick)
+        event: Event = Event(EVENT_TICK, tick, tick.vt_symbol)
+
+        # Start latency trace from receiving tick
+        if self.tracer:
+            event.trace = self.tracer.start()
+
+        self.event_engine.put(event)
 
     def on_trade(self, trade: TradeData) -> None:
         """
         Trade event push.
-        Trade event of a specific vt_symbol is also pushed.
+        Handlers of EVENT_TRADE + vt_symbol also receive the event.
         """
-        self.on_event(EVENT_TRADE, trade)
-        self.on_event(EVENT_TRADE + trade.vt_symbol, trade)
+        self.on_event(EVENT_TRADE, trade, trade.vt_symbol)
 
     def on_order(self, order: OrderData) -> None:
         """
         Order event push.
-        Order event of a specific vt_orderid is also pushed.
+        Handlers of EVENT_ORDER + vt_orderid also receive the event.
         """
-        self.on_event(EVENT_ORDER, order)
-        self.on_event(EVENT_ORDER + order.vt_orderid, order)
+        self.on_event(EVENT_ORDER, order, order.vt_orderid)
 
     def on_position(self, position: PositionData) -> None:
         """
         Position event push.
-        Position event of a specific vt_symbol is also pushed.
+        Handlers of EVENT_POSITION + vt_symbol also receive the event.
         """
-        self.on_event(EVENT_POSITION, position)
-        self.on_event(EVENT_POSITION + position.vt_symbol, position)
+        self.on_event(EVENT_POSITION, position, position.vt_symbol)
 
     def on_account(self, account: AccountData) -> None:
         """
         Account event push.
-        Account event of a specific vt_accountid is also pushed.
+        Handlers of EVENT_ACCOUNT + vt_accountid also receive the event.
         """
-        self.on_event(EVENT_ACCOUNT, account)
-        self.on_event(EVENT_ACCOUNT + account.vt_accountid, account)
+        self.on_event(EVENT_ACCOUNT, account, account.vt_accountid)
 
     def on_quote(self, quote: QuoteData) -> None:
         """
         Quote event push.
-        Quote event of a specific vt_symbol is also pushed.
+        Handlers of EVENT_QUOTE + vt_symbol also receive the event.
         """
-        self.on_event(EVENT_QUOTE, quote)
-        self.on_event(EVENT_QUOTE + quote.vt_symbol, quote)
+        self.on_event(EVENT_QUOTE, quote, quote.vt_symbol)
 
     def on_log(self, log: LogData) -> None:
         """
@@ -150,6 +152,14 @@ class BaseGateway(ABC):
         """
         self.on_event(EVENT_CONTRACT, contract)
 
+    def on_contracts(self, contracts: list[ContractData]) -> None:
+        """
+        Bulk contract event push, used to push all contracts at once
+        after connected. Only OmsEngine processes this event, other
+        apps should query contracts from main engine.
+        """
+        self.on_event(EVENT_CONTRACTS, contracts)
+
     def write_log(self, msg: str) -> None:
         """
         Write a log event from gateway.
@@ -220,6 +230,26 @@ class BaseGateway(ABC):
         """
         pass
 
+    def send_orders(self, reqs: list[OrderRequest]) -> list[str]:
+        """
+        Send a batch of new orders to server, and return vt_orderids in
+        the same sequence of reqs ("" for those failed to send).
+
+        Orders are sent one by one with send_order by default, gateway
+        can override it with native batch order interface of server.
+        """
+        return [self.send_order(req) for req in reqs]
+
+    def cancel_orders(self, reqs: list[CancelRequest]) -> None:
+        """
+        Cancel a batch of existing orders.
+
+        Orders are cancelled one by one with cancel_order by default,
+        gateway can override it with native batch cancel interface.
+        """
+        for req in reqs:
+            self.cancel_order(req)
+
     def send_quote(self, req: QuoteRequest) -> str:
         """
         Send a new two-sided quote to server.
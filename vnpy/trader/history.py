@@ -0,0 +1,220 @@
+"""
+Retention policy and on-disk archive for OMS history data.
+"""
+
+import pickle
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any
+
+
+class HistoryRetention:
+    """
+    Tracks inactive records in the order they became inactive, and
+    decides which ones exceed the retention limits.
+
+    A record is kept if it is among the latest count ones and became
+    inactive within the last seconds. Zero means no limit.
+    """
+
+    def __init__(self, count: int = 0, seconds: float = 0) -> None:
+        """"""
+        self.count: int = count
+        self.seconds: float = seconds
+
+        self.inactive_times: OrderedDict[str, float] = OrderedDict()
+
+    def is_enabled(self) -> bool:
+        """
+        Check if any retention limit is set.
+        """
+        return bool(self.count or self.seconds)
+
+    def add(self, vt_id: str) -> list[str]:
+        """
+        Add an inactive record and return ids of records to be evicted.
+        """
+        now: float = monotonic()
+
+        self.inactive_times[vt_id] = now
+        self.inactive_times.move_to_end(vt_id)
+
+        evicted: list[str] = []
+
+        if self.count:
+            while len(self.inactive_times) > self.count:
+                evicted.append(self.inactive_times.popitem(last=False)[0])
+
+        if self.seconds:
+            deadline: float = now - self.seconds
+
+            while self.inactive_times:
+                oldest_id, oldest_time = next(iter(self.inactive_times.items()))
+                if oldest_time >= deadline:
+                    break
+
+                self.inactive_times.popitem(last=False)
+                evicted.append(oldest_id)
+
+        return evicted
+
+    def remove(self, vt_id: str) -> None:
+        """
+        Stop tracking a record which becomes active again.
+        """
+        self.inactive_times.pop(vt_id, None)
+
+
+class HistoryArchive:
+    """
+    Append-only on-disk log of evicted records, backed by sqlite and
+    indexed by vt_id for lookup.
+
+    Records are written in batches by a background thread, so that
+    saving never blocks the caller (event thread) on disk io. Records
+    waiting to be written are kept in memory and can still be loaded.
+
+    Archive only covers the current session, data left by previous
+    sessions is cleared when opened, since gateways may reuse order ids
+    across trading days.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """"""
+        self.path: Path = path
+        self.tables: set[str] = set()
+
+        # Lock of database connection, shared by writer thread and loading
+        self.lock: Lock = Lock()
+
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            str(path),
+            check_same_thread=False
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        self._clear_tables()
+
+        # Records saved but not written yet, key is (table, vt_id)
+        self.pending: dict[tuple[str, str], Any] = {}
+        self.pending_lock: Lock = Lock()
+
+        self.queue: Queue = Queue()
+        self.active: bool = True
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def _clear_tables(self) -> None:
+        """"""
+        rows: list[tuple] = self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall()
+
+        for row in rows:
+            self.connection.execute(f"DROP TABLE IF EXISTS {row[0]}")
+        self.connection.commit()
+
+    def _init_table(self, table: str) -> None:
+        """"""
+        if table in self.tables:
+            return
+
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (vt_id TEXT NOT NULL, data BLOB NOT NULL)"
+        )
+        self.connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_vt_id ON {table} (vt_id)"
+        )
+        self.tables.add(table)
+
+    def save(self, table: str, records: list[tuple[str, Any]]) -> None:
+        """
+        Append records of (vt_id, data) into table without waiting for
+        them to be written.
+        """
+        if not records:
+            return
+
+        with self.pending_lock:
+            for vt_id, data in records:
+                self.pending[(table, vt_id)] = data
+
+        self.queue.put((table, records))
+
+    def run(self) -> None:
+        """
+        Write records saved into database in batches.
+        """
+        while self.active or not self.queue.empty():
+            try:
+                batches: list[tuple[str, list]] = [self.queue.get(block=True, timeout=1)]
+            except Empty:
+                continue
+
+            while True:
+                try:
+                    batches.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            self.write(batches)
+
+    def write(self, batches: list[tuple[str, list]]) -> None:
+        """
+        Write batches of records in one transaction.
+        """
+        with self.lock:
+            for table, records in batches:
+                rows: list[tuple[str, bytes]] = [
+                    (vt_id, pickle.dumps(data)) for vt_id, data in records
+                ]
+
+                self._init_table(table)
+                self.connection.executemany(f"INSERT INTO {table} VALUES (?, ?)", rows)
+
+            self.connection.commit()
+
+        # Remove records written, unless saved again in the meantime
+        with self.pending_lock:
+            for table, records in batches:
+                for vt_id, data in records:
+                    key: tuple[str, str] = (table, vt_id)
+                    if self.pending.get(key, None) is data:
+                        self.pending.pop(key)
+
+    def load(self, table: str, vt_id: str) -> Any | None:
+        """
+        Load the latest record of vt_id from table.
+        """
+        with self.pending_lock:
+            data: Any | None = self.pending.get((table, vt_id), None)
+
+        if data is not None:
+            return data
+
+        with self.lock:
+            self._init_table(table)
+            row: tuple | None = self.connection.execute(
+                f"SELECT data FROM {table} WHERE vt_id = ? ORDER BY rowid DESC LIMIT 1",
+                (vt_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return pickle.loads(row[0])
+
+    def close(self) -> None:
+        """
+        Write records left and close database connection.
+        """
+        self.active = False
+        self.thread.join()
+
+        with self.lock:
+            self.connection.close()
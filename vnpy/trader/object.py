@@ -2,8 +2,13 @@
 Basic data structure used for general trading function in the trading platform.
 """
 
+from collections.abc import Iterator
+from copy import copy
 from dataclasses import dataclass, field
-from datetime import datetime as Datetime
+from datetime import datetime as Datetime, tzinfo as Tzinfo
+from typing import Any, TypeVar
+
+import numpy as np
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
@@ -14,6 +19,23 @@ INFO: int = 20
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
 
+# Cache of vt_symbol strings, shared by all objects of the same contract.
+VT_SYMBOLS: dict[tuple[str, Exchange], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    Get cached vt_symbol of symbol and exchange.
+    """
+    vt_symbol: str | None = VT_SYMBOLS.get((symbol, exchange), None)
+
+    if vt_symbol is None:
+        vt_symbol = f"{symbol}.{exchange.value}"
+        VT_SYMBOLS[(symbol, exchange)] = vt_symbol
+
+    return vt_symbol
+
+
 @dataclass
 class BaseData:
     """
@@ -81,7 +103,7 @@ class TickData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -105,7 +127,105 @@ class BarData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+
+
+@dataclass(slots=True)
+class SlotTickData:
+    """
+    Tick data with the same fields as TickData, but uses __slots__
+    instead of per-object __dict__ to reduce memory and allocation cost.
+
+    It can be passed to on_tick of gateway, BarGenerator and OmsEngine
+    in place of TickData. Note that no attribute other than fields can
+    be set, and __dict__ is not available.
+    """
+
+    gateway_name: str
+
+    symbol: str
+    exchange: Exchange
+    datetime: Datetime
+
+    name: str = ""
+    volume: float = 0
+    turnover: float = 0
+    open_interest: float = 0
+    last_price: float = 0
+    last_volume: float = 0
+    limit_up: float = 0
+    limit_down: float = 0
+
+    open_price: float = 0
+    high_price: float = 0
+    low_price: float = 0
+    pre_close: float = 0
+
+    bid_price_1: float = 0
+    bid_price_2: float = 0
+    bid_price_3: float = 0
+    bid_price_4: float = 0
+    bid_price_5: float = 0
+
+    ask_price_1: float = 0
+    ask_price_2: float = 0
+    ask_price_3: float = 0
+    ask_price_4: float = 0
+    ask_price_5: float = 0
+
+    bid_volume_1: float = 0
+    bid_volume_2: float = 0
+    bid_volume_3: float = 0
+    bid_volume_4: float = 0
+    bid_volume_5: float = 0
+
+    ask_volume_1: float = 0
+    ask_volume_2: float = 0
+    ask_volume_3: float = 0
+    ask_volume_4: float = 0
+    ask_volume_5: float = 0
+
+    localtime: Datetime | None = None
+
+    extra: dict | None = field(default=None, init=False)
+    vt_symbol: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """"""
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
+
+
+@dataclass(slots=True)
+class SlotBarData:
+    """
+    Bar data with the same fields as BarData, but uses __slots__
+    instead of per-object __dict__ to reduce memory and allocation cost.
+
+    It can be used in place of BarData, with the same limitation as
+    SlotTickData.
+    """
+
+    gateway_name: str
+
+    symbol: str
+    exchange: Exchange
+    datetime: Datetime
+
+    interval: Interval | None = None
+    volume: float = 0
+    turnover: float = 0
+    open_interest: float = 0
+    open_price: float = 0
+    high_price: float = 0
+    low_price: float = 0
+    close_price: float = 0
+
+    extra: dict | None = field(default=None, init=False)
+    vt_symbol: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """"""
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -425,3 +545,297 @@ class QuoteRequest:
             gateway_name=gateway_name,
         )
         return quote
+
+
+BatchType = TypeVar("BatchType", bound="BaseBatch")
+
+
+class BaseBatch:
+    """
+    Columnar container of market data of one contract, which stores
+    each field in a contiguous NumPy array instead of a list of objects.
+
+    Datetime fields are stored as naive datetime64[us] columns. The
+    datetime field is converted to local time of tzinfo, which is
+    attached again when rows are materialized.
+    """
+
+    # Data class used for materializing rows
+    data_class: type
+
+    # Fields stored as float64 columns
+    float_fields: tuple[str, ...] = ()
+
+    # Fields stored as datetime64[us] columns
+    datetime_fields: tuple[str, ...] = ("datetime",)
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        gateway_name: str,
+        columns: dict[str, np.ndarray],
+        tzinfo: Tzinfo | None = None
+    ) -> None:
+        """"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.gateway_name: str = gateway_name
+        self.columns: dict[str, np.ndarray] = columns
+        self.tzinfo: Tzinfo | None = tzinfo
+
+        self.vt_symbol: str = get_vt_symbol(symbol, exchange)
+
+    @classmethod
+    def _convert_columns(cls, objects: list, tzinfo: Tzinfo | None) -> dict[str, np.ndarray]:
+        """
+        Convert fields of data objects into columns.
+        """
+        columns: dict[str, np.ndarray] = {}
+
+        for name in cls.datetime_fields:
+            values: list[Datetime | None] = [getattr(obj, name) for obj in objects]
+
+            if name == "datetime" and tzinfo:
+                values = [dt.astimezone(tzinfo).replace(tzinfo=None) for dt in values]    # type: ignore
+
+            columns[name] = np.array(values, dtype="datetime64[us]")
+
+        for name in cls.float_fields:
+            columns[name] = np.fromiter(
+                (getattr(obj, name) for obj in objects),
+                dtype=np.float64,
+                count=len(objects)
+            )
+
+        return columns
+
+    def _get_attributes(self) -> dict[str, Any]:
+        """
+        Get attributes shared by all rows, used for creating data object.
+        """
+        return {
+            "symbol": self.symbol,
+            "exchange": self.exchange,
+            "gateway_name": self.gateway_name,
+        }
+
+    def _get_row(self, index: int) -> dict[str, Any]:
+        """
+        Get field values of a row as Python objects.
+        """
+        row: dict[str, Any] = self._get_attributes()
+
+        for name in self.datetime_fields:
+            value: np.datetime64 = self.columns[name][index]
+
+            if np.isnat(value):
+                row[name] = None
+                continue
+
+            item: Any = value.item()
+            if name == "datetime" and isinstance(item, Datetime):
+                item = item.replace(tzinfo=self.tzinfo)
+            row[name] = item
+
+        for name in self.float_fields:
+            row[name] = float(self.columns[name][index])
+
+        return row
+
+    def _create_slice(self: BatchType, columns: dict[str, np.ndarray]) -> BatchType:
+        """
+        Create a new batch with the same attributes from sliced columns.
+        """
+        batch: BatchType = copy(self)
+        batch.columns = columns
+        return batch
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.columns["datetime"])
+
+    def __getitem__(self, index: Any) -> Any:
+        """
+        Materialize a row into data object if index is integer, or return
+        a batch view without copying data if index is slice.
+        """
+        if isinstance(index, slice):
+            return self._create_slice({k: v[index] for k, v in self.columns.items()})
+
+        return self.data_class(**self._get_row(index))
+
+    def __iter__(self) -> Iterator:
+        """"""
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_pandas(self) -> Any:
+        """
+        Convert into pandas DataFrame, columns are used without copy.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, copy=False)
+
+    def to_polars(self) -> Any:
+        """
+        Convert into polars DataFrame, numeric columns are used without copy.
+        """
+        import polars as pl
+
+        return pl.DataFrame(self.columns)
+
+
+class BarBatch(BaseBatch):
+    """
+    Columnar container of bar data of one contract and interval.
+    """
+
+    data_class: type = BarData
+
+    float_fields: tuple[str, ...] = (
+        "volume",
+        "turnover",
+        "open_interest",
+        "open_price",
+        "high_price",
+        "low_price",
+        "close_price",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval | None,
+        gateway_name: str,
+        columns: dict[str, np.ndarray],
+        tzinfo: Tzinfo | None = None
+    ) -> None:
+        """"""
+        super().__init__(symbol, exchange, gateway_name, columns, tzinfo)
+
+        self.interval: Interval | None = interval
+
+    @classmethod
+    def from_bars(cls, bars: list[BarData]) -> "BarBatch":
+        """
+        Create batch from list of bar data of the same contract.
+        """
+        if not bars:
+            raise ValueError("Cannot create BarBatch from empty list")
+
+        bar: BarData = bars[0]
+        tzinfo: Tzinfo | None = bar.datetime.tzinfo
+
+        return cls(
+            symbol=bar.symbol,
+            exchange=bar.exchange,
+            interval=bar.interval,
+            gateway_name=bar.gateway_name,
+            columns=cls._convert_columns(bars, tzinfo),
+            tzinfo=tzinfo
+        )
+
+    def _get_attributes(self) -> dict[str, Any]:
+        """"""
+        attributes: dict[str, Any] = super()._get_attributes()
+        attributes["interval"] = self.interval
+        return attributes
+
+    def to_bars(self) -> list[BarData]:
+        """
+        Materialize all rows into list of bar data.
+        """
+        return list(self)
+
+
+class TickBatch(BaseBatch):
+    """
+    Columnar container of tick data of one contract.
+    """
+
+    data_class: type = TickData
+
+    float_fields: tuple[str, ...] = (
+        "volume",
+        "turnover",
+        "open_interest",
+        "last_price",
+        "last_volume",
+        "limit_up",
+        "limit_down",
+        "open_price",
+        "high_price",
+        "low_price",
+        "pre_close",
+        "bid_price_1",
+        "bid_price_2",
+        "bid_price_3",
+        "bid_price_4",
+        "bid_price_5",
+        "ask_price_1",
+        "ask_price_2",
+        "ask_price_3",
+        "ask_price_4",
+        "ask_price_5",
+        "bid_volume_1",
+        "bid_volume_2",
+        "bid_volume_3",
+        "bid_volume_4",
+        "bid_volume_5",
+        "ask_volume_1",
+        "ask_volume_2",
+        "ask_volume_3",
+        "ask_volume_4",
+        "ask_volume_5",
+    )
+
+    datetime_fields: tuple[str, ...] = ("datetime", "localtime")
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        name: str,
+        gateway_name: str,
+        columns: dict[str, np.ndarray],
+        tzinfo: Tzinfo | None = None
+    ) -> None:
+        """"""
+        super().__init__(symbol, exchange, gateway_name, columns, tzinfo)
+
+        self.name: str = name
+
+    @classmethod
+    def from_ticks(cls, ticks: list[TickData]) -> "TickBatch":
+        """
+        Create batch from list of tick data of the same contract.
+        """
+        if not ticks:
+            raise ValueError("Cannot create TickBatch from empty list")
+
+        tick: TickData = ticks[0]
+        tzinfo: Tzinfo | None = tick.datetime.tzinfo
+
+        return cls(
+            symbol=tick.symbol,
+            exchange=tick.exchange,
+            name=tick.name,
+            gateway_name=tick.gateway_name,
+            columns=cls._convert_columns(ticks, tzinfo),
+            tzinfo=tzinfo
+        )
+
+    def _get_attributes(self) -> dict[str, Any]:
+        """"""
+        attributes: dict[str, Any] = super()._get_attributes()
+        attributes["name"] = self.name
+        return attributes
+
+    def to_ticks(self) -> list[TickData]:
+        """
+        Materialize all rows into list of tick data.
+        """
+        return list(self)
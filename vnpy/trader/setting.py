@@ -35,6 +35,18 @@ SETTINGS: dict = {
     "database.port": 0,
     "database.user": "",
     "database.password": "",
+
+    "oms.history_count": 0,
+    "oms.history_minutes": 0,
+    "oms.history_filename": "oms_history.db",
+    "oms.change_count": 100_000,
+
+    "risk.active": False,
+    "risk.order_rate_limit": 0,
+    "risk.active_order_limit": 0,
+    "risk.notional_limit": 0,
+    "risk.position_limit": 0,
+    "risk.self_cross_check": True,
     
     # 语言设置
     "language": "zh_CN",  # 默认中文，可选: zh_CN, en